@@ -3,5 +3,4 @@
 #   - disable certain type for selection in the viewport same as status bar
 #   - shortcut support
 #   - update on selection
-#   - add, replace, subtract select by name
 #   - recursive or not select by name
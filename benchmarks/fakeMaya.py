@@ -0,0 +1,710 @@
+"""
+Stand-in for the parts of maya.cmds and maya.api.OpenMaya the selection editor uses.
+
+Install it with install() before importing the editor. The scene is held in plain dicts so that
+synthetic scenes of several hundred thousand nodes can be generated and queried without Maya.
+"""
+import fnmatch
+import itertools
+import sys
+import types
+
+
+class Node(object):
+
+    __slots__ = ('longName', 'type', 'parent', 'children', 'isReferenced', 'isController', 'uuid', 'handle')
+
+    def __init__(self, longName, type_, parent=None, isReferenced=False, isController=False):
+        self.longName = longName
+        self.type = type_
+        self.parent = parent
+        self.children = list()
+        self.isReferenced = isReferenced
+        self.isController = isController
+        self.uuid = None
+        self.handle = None
+
+    @property
+    def name(self):
+        return self.longName.split('|')[-1]
+
+
+SHAPE_TYPES = ('mesh', 'nurbsCurve', 'nurbsSurface', 'locator', 'camera')
+DAG_TYPES = ('transform', 'joint') + SHAPE_TYPES
+DERIVED_TYPES = {'transform': ['transform', 'joint'], 'shape': list(SHAPE_TYPES), 'dagNode': list(DAG_TYPES)}
+NODE_TYPES = DAG_TYPES + ('objectSet', 'dependNode')
+
+
+class Scene(object):
+
+    def __init__(self):
+        self.nodes = dict()
+        self.byName = dict()
+        self.selection = list()
+        self.counter = itertools.count(1)
+        self.callbacks = dict()
+        self.callbackIds = itertools.count(1)
+        self.calls = 0
+
+    def clear(self):
+        """Empty the scene like file new, registered callbacks are kept and handles are never reused."""
+        self.fire('beforeNew')
+        self.nodes = dict()
+        self.byName = dict()
+        self.fire('afterNew')
+        self.setSelection([])
+
+    def addNode(self, name, type_, parent=None, isReferenced=False, isController=False):
+        if parent is not None:
+            longName = '{}|{}'.format(parent, name)
+        elif type_ in DAG_TYPES:
+            longName = '|{}'.format(name)
+        else:
+            longName = name
+        node = Node(longName, type_, parent, isReferenced, isController)
+        node.handle = next(self.counter)
+        node.uuid = 'UUID-{:08X}'.format(node.handle)
+        self.nodes[longName] = node
+        self.byName.setdefault(name, node)
+        if parent is not None:
+            self.nodes[parent].children.append(node)
+        for func, clientData in self.callbacksFor('nodeAdded'):
+            func(MObject(node), clientData)
+        return longName
+
+    def deleteNode(self, longName):
+        node = self.nodes[longName]
+        for child in list(node.children):
+            self.deleteNode(child.longName)
+        for func, clientData in self.callbacksFor('nodeRemoved'):
+            func(MObject(node), clientData)
+        del self.nodes[longName]
+        if self.byName.get(node.name) is node:
+            del self.byName[node.name]
+        if node.parent is not None:
+            self.nodes[node.parent].children.remove(node)
+        self.selection = [s for s in self.selection if s.split('.')[0] != longName]
+        return node
+
+    def renameNode(self, longName, newName):
+        node = self.nodes[longName]
+        prevName = node.name
+        newLongName = longName[:len(longName) - len(prevName)] + newName
+
+        def move(n, old, new):
+            del self.nodes[n.longName]
+            n.longName = new + n.longName[len(old):]
+            self.nodes[n.longName] = n
+            for c in n.children:
+                c.parent = n.longName
+                move(c, old, new)
+
+        move(node, longName, newLongName)
+        self.byName.pop(prevName, None)
+        self.byName[newName] = node
+        self.selection = [newLongName + s[len(longName):] if s.split('.')[0] == longName else s for s in self.selection]
+        for func, clientData in self.callbacksFor('nameChanged'):
+            func(MObject(node), prevName, clientData)
+        return newLongName
+
+    def find(self, name):
+        name = name.split('.')[0]
+        node = self.nodes.get(name)
+        if node is None:
+            node = self.byName.get(name.split('|')[-1])
+        if node is None:
+            raise ValueError('No object matches name: {}'.format(name))
+        return node
+
+    def addCallback(self, event, func, clientData=None):
+        cid = next(self.callbackIds)
+        self.callbacks[cid] = (event, func, clientData)
+        return cid
+
+    def callbacksFor(self, event):
+        return [(f, c) for e, f, c in list(self.callbacks.values()) if e == event]
+
+    def fire(self, event):
+        for func, clientData in self.callbacksFor(event):
+            func(clientData)
+
+    def setSelection(self, nodes):
+        self.selection = list(nodes)
+        self.fire('SelectionChanged')
+
+
+scene = Scene()
+
+
+def generateScene(count, namespaces=4, referencedRatio=.5, shapeRatio=.6, controllerRatio=.2, sets=0):
+    """Build a synthetic scene of roughly `count` selectable nodes and return their long names."""
+    scene.clear()
+    selectable = list()
+    perNamespace = max(1, count // max(1, namespaces))
+    for nsIndex in range(max(1, namespaces)):
+        ns = 'char{:02d}:'.format(nsIndex) if namespaces else ''
+        isReferenced = bool(namespaces) and nsIndex < namespaces * referencedRatio
+        root = scene.addNode('{}root'.format(ns), 'transform', isReferenced=isReferenced)
+        selectable.append(root)
+        parent = root
+        for i in range(perNamespace - 1):
+            if i % 50 == 0:
+                parent = scene.addNode('{}grp_{:05d}'.format(ns, i), 'transform', root, isReferenced)
+                selectable.append(parent)
+                continue
+            if i % 7 == 0:
+                selectable.append(scene.addNode('{}jnt_{:06d}'.format(ns, i), 'joint', parent, isReferenced))
+                continue
+            isController = (i % 100) < controllerRatio * 100
+            node = scene.addNode('{}ctrl_{:06d}'.format(ns, i), 'transform', parent, isReferenced, isController)
+            if (i % 100) < shapeRatio * 100:
+                shapeType = 'nurbsCurve' if isController else 'mesh'
+                scene.addNode('{}ctrl_{:06d}Shape'.format(ns, i), shapeType, node, isReferenced)
+            selectable.append(node)
+    for i in range(sets):
+        selectable.append(scene.addNode('set{}'.format(i + 1), 'objectSet'))
+    return selectable
+
+
+def _count():
+    scene.calls += 1
+
+
+def _flatten(args):
+    result = list()
+    for arg in args:
+        if isinstance(arg, (list, tuple)):
+            result.extend(arg)
+        elif arg is not None:
+            result.append(arg)
+    return result
+
+
+def _matches(node, pattern, recursive):
+    name = node.name
+    if fnmatch.fnmatchcase(name, pattern) or fnmatch.fnmatchcase(node.longName, pattern):
+        return True
+    if recursive and ':' not in pattern:
+        return fnmatch.fnmatchcase(name.split(':')[-1], pattern)
+    return False
+
+
+def _isA(node, types_):
+    for t in types_:
+        if node.type == t:
+            return True
+        if t == 'shape' and node.type in SHAPE_TYPES:
+            return True
+        if t == 'dagNode' and node.type in DAG_TYPES:
+            return True
+        if t == 'transform' and node.type == 'joint':
+            return True
+    return False
+
+
+def _componentSplit(name):
+    if '.' in name:
+        obj, comp = name.split('.', 1)
+        return obj, '.' + comp
+    return name, ''
+
+
+class cmds(object):
+
+    @staticmethod
+    def ls(*args, **kwargs):
+        _count()
+        sl = kwargs.get('sl') or kwargs.get('selection')
+        long_ = kwargs.get('long') or kwargs.get('l')
+        showType = kwargs.get('showType') or kwargs.get('st')
+        types_ = kwargs.get('type') or kwargs.get('typ')
+        recursive = kwargs.get('recursive') or kwargs.get('r')
+        uuid = kwargs.get('uuid')
+        referencedNodes = kwargs.get('referencedNodes') or kwargs.get('rn')
+        if isinstance(types_, str):
+            types_ = [types_]
+
+        names = _flatten(args)
+        if sl:
+            entries = [(scene.nodes[n.split('.')[0]], _componentSplit(n)[1]) for n in scene.selection]
+        elif names:
+            entries = list()
+            for pattern in names:
+                obj, comp = _componentSplit(pattern)
+                if any(c in obj for c in '*?[') or (recursive and '|' not in obj and obj not in scene.byName):
+                    entries.extend((n, comp) for n in scene.nodes.values() if _matches(n, obj, recursive))
+                else:
+                    try:
+                        entries.append((scene.find(obj), comp))
+                    except ValueError:
+                        pass
+        elif args:
+            return list()
+        else:
+            entries = [(n, '') for n in scene.nodes.values()]
+
+        if types_:
+            entries = [(n, c) for n, c in entries if _isA(n, types_)]
+        if referencedNodes:
+            entries = [(n, c) for n, c in entries if n.isReferenced]
+
+        if uuid:
+            return [n.uuid for n, c in entries]
+
+        result = list()
+        for node, comp in entries:
+            result.append((node.longName if long_ else node.name) + comp)
+            if showType:
+                result.append(node.type)
+        return result
+
+    @staticmethod
+    def objectType(node, isAType=None, isType=None):
+        _count()
+        n = scene.find(node)
+        if isAType:
+            return _isA(n, [isAType])
+        if isType:
+            return n.type == isType
+        return n.type
+
+    @staticmethod
+    def listRelatives(node, shapes=False, fullPath=False, parent=False, children=False, **kwargs):
+        _count()
+        n = scene.find(node)
+        if parent:
+            return [n.parent] if n.parent else None
+        result = [c for c in n.children if not shapes or c.type in SHAPE_TYPES]
+        if not result:
+            return None
+        return [c.longName if fullPath else c.name for c in result]
+
+    @staticmethod
+    def referenceQuery(node, isNodeReferenced=False, **kwargs):
+        _count()
+        return scene.find(node).isReferenced
+
+    @staticmethod
+    def controller(node, q=False, isController=False, **kwargs):
+        _count()
+        return scene.find(node).isController
+
+    @staticmethod
+    def select(*args, **kwargs):
+        _count()
+        names = _flatten(args)
+        if kwargs.get('clear') or kwargs.get('cl'):
+            scene.setSelection([])
+            return
+        resolved = list()
+        for name in names:
+            obj, comp = _componentSplit(name)
+            if any(c in obj for c in '*?'):
+                resolved.extend(n.longName + comp for n in scene.nodes.values() if _matches(n, obj, True))
+            else:
+                resolved.append(scene.find(obj).longName + comp)
+        if kwargs.get('add') or kwargs.get('af'):
+            current = list(scene.selection)
+            current.extend(r for r in resolved if r not in set(current))
+            scene.setSelection(current)
+        elif kwargs.get('deselect') or kwargs.get('d'):
+            removed = set(resolved)
+            scene.setSelection([s for s in scene.selection if s not in removed])
+        else:
+            scene.setSelection(resolved)
+
+    @staticmethod
+    def nodeType(name, derived=False, isTypeName=False, **kwargs):
+        _count()
+        if isTypeName and derived:
+            # like Maya, unknown type names raise instead of returning nothing
+            if name not in NODE_TYPES and name not in DERIVED_TYPES:
+                raise RuntimeError('Unknown object type: {}'.format(name))
+            return DERIVED_TYPES.get(name, [name])
+        return scene.find(name).type
+
+    @staticmethod
+    def warning(message):
+        print('# Warning: {}'.format(message))
+
+    @staticmethod
+    def internalVar(userAppDir=False, **kwargs):
+        import tempfile
+        return tempfile.gettempdir() + '/'
+
+    @staticmethod
+    def file(*args, **kwargs):
+        if kwargs.get('q') or kwargs.get('query'):
+            return '/tmp/fakeScene.ma'
+        return None
+
+
+# OpenMaya
+
+class MObject(object):
+
+    __slots__ = ('node',)
+
+    def __init__(self, node=None):
+        self.node = node
+
+    def isNull(self):
+        return self.node is None
+
+    def apiTypeStr(self):
+        return self.node.type
+
+    def hasFn(self, fn):
+        return _isA(self.node, [fn])
+
+
+MObject.kNullObj = MObject()
+
+
+class MDagPath(object):
+
+    def __init__(self, node):
+        self._node = node
+
+    def fullPathName(self):
+        return self._node.longName
+
+    def isValid(self):
+        return self._node is not None
+
+    def node(self):
+        return MObject(self._node)
+
+    def numberOfShapesDirectlyBelow(self):
+        return len([c for c in self._node.children if c.type in SHAPE_TYPES])
+
+    def extendToShape(self, index=0):
+        shapes = [c for c in self._node.children if c.type in SHAPE_TYPES]
+        self._node = shapes[index]
+        return self
+
+
+class MObjectHandle(object):
+
+    def __init__(self, obj):
+        self.obj = obj
+
+    def __eq__(self, other):
+        return isinstance(other, MObjectHandle) and self.obj.node is other.obj.node
+
+    def __ne__(self, other):
+        return not self == other
+
+    def hashCode(self):
+        return self.obj.node.handle
+
+    def isValid(self):
+        return self.obj.node is not None and self.obj.node.longName in scene.nodes
+
+    def isAlive(self):
+        return self.isValid()
+
+    def object(self):
+        return self.obj
+
+
+class MSelectionList(object):
+
+    kMergeNormal = 0
+    kXORWithList = 1
+    kRemoveFromList = 2
+
+    def __init__(self, other=None):
+        self.items = list(other.items) if other is not None else list()
+
+    def add(self, item):
+        if isinstance(item, MObject):
+            self.items.append((item.node, ''))
+        else:
+            obj, comp = _componentSplit(item)
+            try:
+                node = scene.find(obj)
+            except ValueError:
+                raise RuntimeError('(kInvalidParameter): Object does not exist')
+            self.items.append((node, comp))
+        return self
+
+    def length(self):
+        return len(self.items)
+
+    def isEmpty(self):
+        return not self.items
+
+    def clear(self):
+        self.items = list()
+        return self
+
+    def getDependNode(self, index):
+        return MObject(self.items[index][0])
+
+    def getDagPath(self, index):
+        node = self.items[index][0]
+        if node.type not in DAG_TYPES:
+            raise TypeError('(kInvalidParameter): Object is not a DAG Node')
+        return MDagPath(node)
+
+    def getComponent(self, index):
+        node, comp = self.items[index]
+        if node.type not in DAG_TYPES:
+            raise TypeError('(kInvalidParameter): Object is neither a DAG Node nor a component')
+        return MDagPath(node), MObject(node if comp else None)
+
+    def getSelectionStrings(self, index=None):
+        items = self.items if index is None else [self.items[index]]
+        return [n.longName + c for n, c in items]
+
+    def merge(self, other, strategy=0):
+        if strategy == self.kRemoveFromList:
+            removed = set(other.items)
+            self.items = [i for i in self.items if i not in removed]
+        elif strategy == self.kXORWithList:
+            current = set(self.items)
+            otherSet = set(other.items)
+            self.items = [i for i in self.items if i not in otherSet] + [i for i in other.items if i not in current]
+        else:
+            current = set(self.items)
+            self.items.extend(i for i in other.items if i not in current)
+        return self
+
+
+class MFnDependencyNode(object):
+
+    def __init__(self, obj=None):
+        self._node = obj.node if obj is not None else None
+
+    def setObject(self, obj):
+        self._node = obj.node
+        return self
+
+    @property
+    def typeName(self):
+        return self._node.type
+
+    def name(self):
+        return self._node.name
+
+    def absoluteName(self):
+        return self._node.name
+
+    @property
+    def isFromReferencedFile(self):
+        return self._node.isReferenced
+
+    def uuid(self):
+        return self._node.uuid
+
+
+class MFnDagNode(MFnDependencyNode):
+
+    def __init__(self, obj=None):
+        if isinstance(obj, MDagPath):
+            obj = obj.node()
+        super(MFnDagNode, self).__init__(obj)
+
+    def childCount(self):
+        return len(self._node.children)
+
+    def child(self, index):
+        return MObject(self._node.children[index])
+
+    def fullPathName(self):
+        return self._node.longName
+
+    def getPath(self):
+        return MDagPath(self._node)
+
+
+class MItDependencyNodes(object):
+
+    def __init__(self, filterType=None):
+        self._nodes = list(scene.nodes.values())
+        self._index = 0
+
+    def isDone(self):
+        return self._index >= len(self._nodes)
+
+    def thisNode(self):
+        return MObject(self._nodes[self._index])
+
+    def next(self):
+        self._index += 1
+
+
+class MGlobal(object):
+
+    kReplaceList = 0
+    kXORWithList = 1
+    kAddToList = 2
+    kRemoveFromList = 3
+
+    @staticmethod
+    def getActiveSelectionList(orderedSelectionIfAvailable=False):
+        _count()
+        sel = MSelectionList()
+        sel.items = [(scene.nodes[_componentSplit(s)[0]], _componentSplit(s)[1]) for s in scene.selection]
+        return sel
+
+    @staticmethod
+    def setActiveSelectionList(sel, listAdjustment=0):
+        _count()
+        MGlobal.selectCommand(sel, listAdjustment)
+
+    @staticmethod
+    def selectCommand(sel, listAdjustment=0):
+        _count()
+        strings = sel.getSelectionStrings()
+        if listAdjustment == MGlobal.kReplaceList:
+            scene.setSelection(strings)
+        elif listAdjustment == MGlobal.kAddToList:
+            current = set(scene.selection)
+            scene.setSelection(scene.selection + [s for s in strings if s not in current])
+        elif listAdjustment == MGlobal.kRemoveFromList:
+            removed = set(strings)
+            scene.setSelection([s for s in scene.selection if s not in removed])
+        else:
+            current = set(scene.selection)
+            other = set(strings)
+            scene.setSelection([s for s in scene.selection if s not in other] + [s for s in strings if s not in current])
+
+
+class MMessage(object):
+
+    @staticmethod
+    def removeCallback(cid):
+        if scene.callbacks.pop(cid, None) is None:
+            raise RuntimeError('(kInvalidParameter): callback id not found')
+
+    @staticmethod
+    def removeCallbacks(ids):
+        for cid in ids:
+            scene.callbacks.pop(cid, None)
+
+
+class MEventMessage(MMessage):
+
+    @staticmethod
+    def addEventCallback(event, func, clientData=None):
+        return scene.addCallback(event, func, clientData)
+
+
+class MDGMessage(MMessage):
+
+    @staticmethod
+    def addNodeAddedCallback(func, nodeType='dependNode', clientData=None):
+        return scene.addCallback('nodeAdded', func, clientData)
+
+    @staticmethod
+    def addNodeRemovedCallback(func, nodeType='dependNode', clientData=None):
+        return scene.addCallback('nodeRemoved', func, clientData)
+
+
+class MNodeMessage(MMessage):
+
+    @staticmethod
+    def addNameChangedCallback(obj, func, clientData=None):
+        return scene.addCallback('nameChanged', func, clientData)
+
+
+class MDagMessage(MMessage):
+
+    @staticmethod
+    def addAllDagChangesCallback(func, clientData=None):
+        return scene.addCallback('dagChanged', func, clientData)
+
+    @staticmethod
+    def addParentAddedCallback(func, clientData=None):
+        return scene.addCallback('parentAdded', func, clientData)
+
+    @staticmethod
+    def addParentRemovedCallback(func, clientData=None):
+        return scene.addCallback('parentRemoved', func, clientData)
+
+
+class MSceneMessage(MMessage):
+
+    kBeforeOpen = 'beforeOpen'
+    kBeforeNew = 'beforeNew'
+    kAfterOpen = 'afterOpen'
+    kAfterSave = 'afterSave'
+    kAfterNew = 'afterNew'
+    kAfterLoadReference = 'afterLoadReference'
+    kAfterUnloadReference = 'afterUnloadReference'
+    kAfterCreateReference = 'afterCreateReference'
+    kAfterRemoveReference = 'afterRemoveReference'
+
+    @staticmethod
+    def addCallback(message, func, clientData=None):
+        return scene.addCallback(message, func, clientData)
+
+
+class MMatrix(object):
+    pass
+
+
+class MFn(object):
+    kShape = 'shape'
+    kTransform = 'transform'
+    kDagNode = 'dagNode'
+
+
+class MQtUtil(object):
+
+    window = None
+
+    @staticmethod
+    def mainWindow():
+        from PySide2.QtWidgets import QMainWindow
+        import shiboken2
+        if MQtUtil.window is None:
+            MQtUtil.window = QMainWindow()
+        return shiboken2.getCppPointer(MQtUtil.window)[0]
+
+
+class MayaQWidgetDockableMixin(object):
+    pass
+
+
+def install():
+    """Register the stand-in modules under the maya package names."""
+    maya = types.ModuleType('maya')
+    api = types.ModuleType('maya.api')
+    om = types.ModuleType('maya.api.OpenMaya')
+    omui = types.ModuleType('maya.OpenMayaUI')
+    cmdsModule = types.ModuleType('maya.cmds')
+    app = types.ModuleType('maya.app')
+    general = types.ModuleType('maya.app.general')
+    mixin = types.ModuleType('maya.app.general.mayaMixin')
+
+    for name in dir(cmds):
+        if not name.startswith('_'):
+            setattr(cmdsModule, name, getattr(cmds, name))
+
+    for cls in (MObject, MItDependencyNodes, MDagPath, MObjectHandle, MSelectionList, MFnDependencyNode, MFnDagNode, MGlobal,
+                MMessage, MEventMessage, MDGMessage, MNodeMessage, MDagMessage, MSceneMessage, MMatrix, MFn):
+        setattr(om, cls.__name__, cls)
+    omui.MQtUtil = MQtUtil
+    mixin.MayaQWidgetDockableMixin = MayaQWidgetDockableMixin
+
+    maya.cmds = cmdsModule
+    maya.api = api
+    maya.OpenMayaUI = omui
+    maya.app = app
+    api.OpenMaya = om
+    app.general = general
+    general.mayaMixin = mixin
+
+    sys.modules.update({
+        'maya': maya,
+        'maya.api': api,
+        'maya.api.OpenMaya': om,
+        'maya.OpenMayaUI': omui,
+        'maya.cmds': cmdsModule,
+        'maya.app': app,
+        'maya.app.general': general,
+        'maya.app.general.mayaMixin': mixin,
+    })
@@ -0,0 +1,271 @@
+"""
+Headless benchmarks of the selection editor, run against the stand-in Maya backend of fakeMaya.
+
+    python benchmarks/run.py --sizes 1000 10000 100000 --output results.json
+    python benchmarks/run.py --sizes 1000 10000 --compare results.json --tolerance 1.5
+
+Qt runs on the offscreen platform, so no display or Maya session is needed. Results are written as JSON,
+with --compare the run fails when a timing is slower than the given results by more than the tolerance.
+Stand-in commands are much cheaper than Maya's, cmdsCalls tells how many Maya round trips a step would cost.
+"""
+import argparse
+import importlib
+import json
+import os
+import platform
+import sys
+import time
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+benchmarksDir = os.path.dirname(os.path.abspath(__file__))
+packageDir = os.path.dirname(benchmarksDir)
+sys.path.insert(0, os.path.dirname(packageDir))
+sys.path.insert(0, benchmarksDir)
+
+import fakeMaya
+
+fakeMaya.install()
+
+import PySide2
+from PySide2.QtCore import QItemSelection, QItemSelectionModel
+from PySide2.QtWidgets import QApplication
+
+packageName = os.path.basename(packageDir)
+ui = importlib.import_module('{}.ui'.format(packageName))
+metadata = importlib.import_module('{}.metadata'.format(packageName))
+
+cmds = sys.modules['maya.cmds']
+
+DEFAULT_SIZES = (1000, 10000, 100000, 500000)
+
+
+def measure(func, repeat=1, setup=None):
+    """Return the best duration of func over repeat runs and the cmds calls of the last run, setup is not timed."""
+    best = None
+    calls = 0
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        fakeMaya.scene.calls = 0
+        start = time.time()
+        func()
+        duration = time.time() - start
+        calls = fakeMaya.scene.calls
+        best = duration if best is None else min(best, duration)
+    return best, calls
+
+
+def processEvents():
+    QApplication.processEvents()
+
+
+def queryNodeInfosPerNode(nodes):
+    """Query the node metadata with one round of cmds calls per node, as the editor did before batching it."""
+    infos = list()
+
+    for longName in nodes:
+        nodeType = cmds.objectType(longName)
+        shapes = cmds.listRelatives(longName, shapes=True, fullPath=True) if nodeType != 'objectSet' else None
+        shapType = cmds.objectType(shapes[0]) if shapes else None
+
+        finalType = nodeType if not shapType else shapType
+        isReferenced = cmds.referenceQuery(longName, isNodeReferenced=True)
+
+        infos.append((nodeType, finalType, isReferenced))
+
+    return infos
+
+
+def benchmarkMetadata(nodes):
+    results = dict()
+    if len(nodes) <= 100000:
+        results['metadataPerNode'] = measure(lambda: queryNodeInfosPerNode(nodes))
+    results['metadataBatched'] = measure(lambda: metadata.resolveNodeInfos(nodes))
+    return results
+
+
+def benchmarkTree(nodes):
+    results = dict()
+
+    tree = ui.SelectionTree()
+    tree.resize(400, 800)
+    tree.show()
+    processEvents()
+
+    def load():
+        tree.load(nodes)
+        tree.finishLoading()
+
+    # the first chunk is what the list shows before the scheduler appends the rest
+    results['treeLoadFirstChunk'] = measure(lambda: tree.load(nodes), setup=metadata.nodeInfoCache.clear)
+    results['treeLoadCold'] = measure(load, setup=metadata.nodeInfoCache.clear)
+    results['treeLoadWarm'] = measure(load, repeat=3)
+    results['treePaint'] = measure(lambda: tree.viewport().grab(), repeat=5)
+
+    def toggleNamespaces():
+        tree.toggleNamespaces(not tree.displayNamespaces)
+        tree.viewport().grab()
+
+    results['treeToggleNamespaces'] = measure(toggleNamespaces, repeat=5)
+
+    processEvents()
+
+    def scroll():
+        scrollBar = tree.verticalScrollBar()
+        for value in range(0, scrollBar.maximum(), max(1, scrollBar.maximum() // 20)):
+            scrollBar.setValue(value)
+            tree.viewport().grab()
+
+    results['treeScroll'] = measure(scroll)
+
+    tree.close()
+    tree.deleteLater()
+    processEvents()
+    return results
+
+
+def benchmarkEditor(nodes):
+    results = dict()
+
+    editor = ui.SelectionEditor()
+    editor.show()
+    processEvents()
+
+    def selectSilently(selection, reload=True):
+        # the scene selection is set outside of the timed part, the editor sees it on its next reload
+        ui.selectionHub.timer.stop()
+        fakeMaya.scene.selection = list(selection)
+        if reload:
+            editor.reload()
+
+    results['editorReloadFull'] = measure(
+        editor.reload, setup=lambda: (selectSilently([]), selectSilently(nodes, reload=False))
+    )
+    results['editorReloadAddOne'] = measure(
+        editor.reload, setup=lambda: (selectSilently(nodes[:-1]), selectSilently(nodes, reload=False))
+    )
+    results['editorReloadRemoveOne'] = measure(
+        editor.reload,
+        setup=lambda: (selectSilently(nodes), selectSilently(nodes[1:len(nodes) // 2] + nodes[len(nodes) // 2:], False))
+    )
+
+    # every other vertex of a mesh, which Maya lists as one entry per vertex
+    mesh = cmds.ls(type='mesh', long=True)[0]
+    vertices = ['{}.vtx[{}]'.format(mesh, index * 2) for index in range(len(nodes))]
+    results['editorReloadComponents'] = measure(
+        editor.reload, setup=lambda: (selectSilently([]), selectSilently(vertices, reload=False))
+    )
+
+    tree = editor.selectionTree
+    selectionModel = tree.selectionModel()
+    model = tree.nodeModel
+
+    def selectHalf():
+        selectSilently(nodes)
+        selectionModel.select(
+            QItemSelection(model.index(0), model.index(len(nodes) // 2)), QItemSelectionModel.ClearAndSelect
+        )
+        processEvents()
+
+    def ctrlClick():
+        selectionModel.select(model.index(len(nodes) - 1), QItemSelectionModel.Toggle)
+        processEvents()
+
+    results['editorListClick'] = measure(ctrlClick, repeat=3, setup=selectHalf)
+
+    def burst():
+        for count in range(1, 101):
+            cmds.select(nodes[:count])
+        processEvents()
+
+    results['editorSelectionBurst'] = measure(burst)
+
+    field = editor.selectByNameTypeField
+    for name, text in (('selectByName', 'ctrl_00*'), ('selectByNameAndType', 'ctrl_*, #nurbsCurve, !*5')):
+        field.setText(text)
+        results[name] = measure(lambda: (field.select(), ui.scheduler.finish('select')))
+        processEvents()
+
+    # other modes combine the matches with the current selection on scene index bitsets
+    field.setText('ctrl_00*')
+    for mode in ('add', 'intersect'):
+        field.setMode(mode)
+        results['selectByName{}'.format(mode.title())] = measure(field.select, setup=lambda: selectSilently(nodes))
+        processEvents()
+    field.setMode('replace')
+
+    editor.close()
+    editor.deleteLater()
+    processEvents()
+    return results
+
+
+def run(sizes):
+    QApplication.instance() or QApplication(sys.argv)
+
+    results = list()
+    for size in sizes:
+        start = time.time()
+        nodes = fakeMaya.generateScene(size)
+        sys.stdout.write('{} nodes generated in {:.2f}s\n'.format(len(nodes), time.time() - start))
+
+        for benchmark in (benchmarkMetadata, benchmarkTree, benchmarkEditor):
+            for name, (seconds, calls) in sorted(benchmark(nodes).items()):
+                results.append({'benchmark': name, 'size': size, 'seconds': seconds, 'cmdsCalls': calls})
+                sys.stdout.write('  {:<24} {:>12.6f}s {:>8} cmds\n'.format(name, seconds, calls))
+
+    return {
+        'environment': {
+            'python': platform.python_version(),
+            'pyside': PySide2.__version__,
+            'platform': platform.platform(),
+        },
+        'results': results,
+    }
+
+
+def compare(report, baseline, tolerance):
+    """Return the results slower than their baseline by more than tolerance, ignoring sub-millisecond timings."""
+    baselineSeconds = dict(((r['benchmark'], r['size']), r['seconds']) for r in baseline['results'])
+
+    regressions = list()
+    for result in report['results']:
+        reference = baselineSeconds.get((result['benchmark'], result['size']))
+        if reference is None or result['seconds'] < .001:
+            continue
+        if result['seconds'] > reference * tolerance:
+            regressions.append((result, reference))
+    return regressions
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description='Selection editor benchmarks on a synthetic scene.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+    parser.add_argument('--output', help='write the results to this JSON file')
+    parser.add_argument('--compare', help='JSON results to compare against')
+    parser.add_argument('--tolerance', type=float, default=1.5)
+    args = parser.parse_args(args)
+
+    report = run(args.sizes)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+
+        regressions = compare(report, baseline, args.tolerance)
+        for result, reference in regressions:
+            sys.stdout.write('REGRESSION {benchmark} ({size}): {seconds:.4f}s'.format(**result))
+            sys.stdout.write(' vs {:.4f}s\n'.format(reference))
+        if regressions:
+            return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
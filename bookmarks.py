@@ -0,0 +1,165 @@
+import hashlib
+import io
+import json
+import os
+import re
+
+from maya import cmds
+
+
+class Bookmark(object):
+    """
+    Named selection saved on disk. Only its name and member count are read with the index,
+    members are loaded from their own file the first time they are needed.
+    """
+
+    __slots__ = ('name', 'count', 'fileName', 'store', '_nodes')
+
+    def __init__(self, name, count, fileName, store, nodes=None):
+        self.name = name
+        self.count = count
+        self.fileName = fileName
+        self.store = store
+        self._nodes = nodes
+
+    def __len__(self):
+        return self.count
+
+    def nodes(self):
+        if self._nodes is None:
+            self._nodes = readNodes(os.path.join(self.store.directory, self.fileName))
+        return self._nodes
+
+
+def writeNodes(path, nodes, header=None):
+    with io.open(path, 'w', encoding='utf-8', newline='\n') as f:
+        if header is not None:
+            f.write(u'{}\n'.format(json.dumps(header)))
+        f.write(u'\n'.join(nodes))
+
+
+def readNodes(path, hasHeader=False):
+    with io.open(path, 'r', encoding='utf-8', newline='\n') as f:
+        content = f.read()
+
+    header = None
+    if hasHeader:
+        headerLine, _, content = content.partition(u'\n')
+        header = json.loads(headerLine)
+
+    nodes = content.split(u'\n') if content else list()
+    return (header, nodes) if hasHeader else nodes
+
+
+def sceneKey():
+    """Return the name of the bookmark directory of the scene, None while it is untitled."""
+    scenePath = cmds.file(q=True, sceneName=True)
+    if not scenePath:
+        return None
+
+    baseName = re.sub(r'[^\w.-]', '_', os.path.splitext(os.path.basename(scenePath))[0])
+    pathHash = hashlib.md5(os.path.normcase(os.path.abspath(scenePath)).encode('utf-8')).hexdigest()[:8]
+    return '{}_{}'.format(baseName, pathHash)
+
+
+class BookmarkStore(object):
+    """
+    Bookmarks of one scene. The directory holds an index.json listing names, counts and member files,
+    and one newline separated member file per bookmark. Stores without a directory, those of untitled scenes,
+    keep their bookmarks in memory.
+    """
+
+    indexFileName = 'index.json'
+    exportFormat = 'selectionEditorBookmark'
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.bookmarks = list()
+        self.load()
+
+    @classmethod
+    def forScene(cls, unsaved=None):
+        """
+        Return the store of the current scene. unsaved, the store of the scene while it was untitled, is kept while
+        the scene still is, and its bookmarks are written to the store of the scene once it has been saved.
+        """
+        key = sceneKey()
+        if unsaved is not None and unsaved.directory is not None:
+            unsaved = None
+
+        if key is None:
+            return unsaved if unsaved is not None else cls(None)
+
+        root = os.path.join(cmds.internalVar(userAppDir=True), 'selectionEditor', 'bookmarks')
+        store = cls(os.path.join(root, key))
+        for bookmark in unsaved.bookmarks if unsaved is not None else ():
+            store.add(bookmark.name, bookmark.nodes())
+        return store
+
+    def indexPath(self):
+        return os.path.join(self.directory, self.indexFileName)
+
+    def load(self):
+        self.bookmarks = list()
+        if self.directory is None:
+            return
+
+        try:
+            with io.open(self.indexPath(), 'r', encoding='utf-8') as f:
+                index = json.load(f)
+        except (IOError, OSError, ValueError):
+            return
+
+        for data in index.get('bookmarks', list()):
+            self.bookmarks.append(Bookmark(data['name'], data['count'], data['file'], self))
+
+    def save(self):
+        if self.directory is None:
+            return
+        if not os.path.isdir(self.directory):
+            os.makedirs(self.directory)
+
+        index = {'bookmarks': [{'name': b.name, 'count': b.count, 'file': b.fileName} for b in self.bookmarks]}
+        with io.open(self.indexPath(), 'w', encoding='utf-8') as f:
+            f.write(json.dumps(index, indent=2))
+
+    def uniqueFileName(self):
+        fileNames = set(b.fileName for b in self.bookmarks)
+        index = len(self.bookmarks)
+        while 'bookmark{}.txt'.format(index) in fileNames:
+            index += 1
+        return 'bookmark{}.txt'.format(index)
+
+    def add(self, name, nodes):
+        nodes = list(nodes)
+        bookmark = Bookmark(name, len(nodes), self.uniqueFileName(), self, nodes)
+
+        if self.directory is not None:
+            if not os.path.isdir(self.directory):
+                os.makedirs(self.directory)
+            writeNodes(os.path.join(self.directory, bookmark.fileName), nodes)
+
+        self.bookmarks.append(bookmark)
+        self.save()
+        return bookmark
+
+    def remove(self, bookmark):
+        self.bookmarks.remove(bookmark)
+        if self.directory is None:
+            return
+
+        try:
+            os.remove(os.path.join(self.directory, bookmark.fileName))
+        except OSError:
+            pass
+        self.save()
+
+    def exportFile(self, bookmark, path):
+        header = {'format': self.exportFormat, 'name': bookmark.name, 'count': bookmark.count}
+        writeNodes(path, bookmark.nodes(), header=header)
+
+    def importFile(self, path):
+        header, nodes = readNodes(path, hasHeader=True)
+        if not isinstance(header, dict) or header.get('format') != self.exportFormat:
+            raise ValueError('{} is not a bookmark file'.format(path))
+        return self.add(header.get('name') or os.path.splitext(os.path.basename(path))[0], nodes)
@@ -0,0 +1,51 @@
+from maya.api.OpenMaya import MSceneMessage, MMessage
+
+
+def removeCallbacks(callbackIds):
+    """Remove message callbacks, ids Maya already dropped are ignored."""
+    try:
+        MMessage.removeCallbacks(callbackIds)
+    except RuntimeError:
+        pass
+
+
+class MessageCallbacks(object):
+    """
+    Node and scene message callbacks of data kept current by Maya messages.
+    Node callbacks are dropped before a new scene is created or opened along with the data, every node torn down
+    with the scene would go through them. Subclasses add their callbacks and clear their data.
+    """
+
+    def __init__(self):
+        self.callbackIds = list()
+        self.sceneCallbackIds = list()
+
+    def addNodeCallbacks(self):
+        return list()
+
+    def addSceneCallbacks(self):
+        return [
+            MSceneMessage.addCallback(MSceneMessage.kBeforeNew, self.sceneAboutToChange),
+            MSceneMessage.addCallback(MSceneMessage.kBeforeOpen, self.sceneAboutToChange),
+        ]
+
+    def installNodeCallbacks(self):
+        if not self.callbackIds:
+            self.callbackIds = self.addNodeCallbacks()
+
+    def installSceneCallbacks(self):
+        if not self.sceneCallbackIds:
+            self.sceneCallbackIds = self.addSceneCallbacks()
+
+    def removeNodeCallbacks(self):
+        removeCallbacks(self.callbackIds)
+        self.callbackIds = list()
+
+    def removeCallbacks(self):
+        self.removeNodeCallbacks()
+        removeCallbacks(self.sceneCallbackIds)
+        self.sceneCallbackIds = list()
+
+    def sceneAboutToChange(self, *args):
+        self.removeNodeCallbacks()
+        self.clear()
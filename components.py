@@ -0,0 +1,157 @@
+import re
+from bisect import bisect_left
+
+from maya.api.OpenMaya import MSelectionList
+
+
+componentPattern = re.compile(r'^([^.\[\]]+)\.(\w+)((?:\[[^\]]*\])+)$')
+singleIndexPattern = re.compile(r'^([^.\[\]]+)\.(\w+)\[(\d+)(?::(\d+))?\]$')
+bracketPattern = re.compile(r'\[([^\]]*)\]')
+
+
+class RangeList(object):
+    """Sorted, non overlapping inclusive index ranges, merged as they are added."""
+
+    __slots__ = ('starts', 'stops')
+
+    def __init__(self):
+        self.starts = list()
+        self.stops = list()
+
+    def __len__(self):
+        return sum(self.stops) - sum(self.starts) + len(self.starts)
+
+    def __str__(self):
+        return ','.join(
+            str(start) if start == stop else '{}:{}'.format(start, stop)
+            for start, stop in zip(self.starts, self.stops)
+        )
+
+    def ranges(self):
+        return list(zip(self.starts, self.stops))
+
+    def add(self, start, stop):
+        starts = self.starts
+        stops = self.stops
+
+        # Maya lists components in order, so most ranges extend or follow the last one
+        if not starts or start > stops[-1] + 1:
+            starts.append(start)
+            stops.append(stop)
+            return
+        if start >= starts[-1]:
+            stops[-1] = max(stops[-1], stop)
+            return
+
+        first = bisect_left(stops, start - 1)
+        last = first
+        while last < len(starts) and starts[last] <= stop + 1:
+            last += 1
+
+        if first == last:
+            starts.insert(first, start)
+            stops.insert(first, stop)
+        else:
+            starts[first:last] = [min(start, starts[first])]
+            stops[first:last] = [max(stop, stops[last - 1])]
+
+    @classmethod
+    def parse(cls, text):
+        rangeList = cls()
+        for part in text.split(','):
+            start, _, stop = part.partition(':')
+            rangeList.add(int(start), int(stop or start))
+        return rangeList
+
+
+def splitComponent(entry):
+    """Return (node, componentType, indices) for a component entry such as 'pCube1.vtx[0:4]', None for a node."""
+    if '.' not in entry:
+        return None
+
+    match = componentPattern.match(entry)
+    if match is None:
+        return None
+    return match.groups()
+
+
+def componentNode(entry):
+    """Return the node of a selection entry, the entry itself when it is not a component."""
+    return entry.partition('.')[0]
+
+
+def compactSelection(selection):
+    """
+    Merge the single index components of each node and component type into one entry holding all of their ranges,
+    e.g. 'pCube1.vtx[0:4]' and 'pCube1.vtx[10]' become 'pCube1.vtx[0:4,10]'.
+    Return the entries, in the order their node was first selected, and the number of selected nodes and components.
+    Components are never flattened.
+    """
+    entries = list()
+    count = 0
+    rangeLists = dict()
+
+    for entry in selection:
+        if '.' not in entry:
+            entries.append(entry)
+            count += 1
+            continue
+
+        match = singleIndexPattern.match(entry)
+        if match is None:
+            # components without a single index, such as rotatePivot or cv[0:3][1], are kept as they are
+            entries.append(entry)
+            count += componentCount(entry)
+            continue
+
+        node, componentType, start, stop = match.groups()
+        key = (node, componentType)
+        rangeList = rangeLists.get(key)
+        if rangeList is None:
+            rangeList = rangeLists[key] = RangeList()
+            entries.append(key)
+        rangeList.add(int(start), int(stop or start))
+
+    for index, entry in enumerate(entries):
+        if isinstance(entry, tuple):
+            rangeList = rangeLists[entry]
+            count += len(rangeList)
+            entries[index] = '{}.{}[{}]'.format(entry[0], entry[1], rangeList)
+
+    return entries, count
+
+
+def componentCount(entry):
+    """Return the number of nodes or components in an entry, computed from its ranges."""
+    split = splitComponent(entry)
+    if split is None:
+        return 1
+
+    count = 1
+    for indices in bracketPattern.findall(split[2]):
+        if not indices or not indices[0].isdigit():
+            return 1
+        count *= len(RangeList.parse(indices))
+    return count
+
+
+def selectionStrings(entry):
+    """Return the strings Maya accepts for an entry, one per range for merged components."""
+    split = splitComponent(entry)
+    if split is None or ',' not in split[2]:
+        return [entry]
+
+    node, componentType, indices = split
+    return ['{}.{}[{}]'.format(node, componentType, part) for part in indices[1:-1].split(',')]
+
+
+def createSelectionList(nodes, selectionList=None):
+    """Return an MSelectionList of the nodes and components that still exist in the scene."""
+    selectionList = MSelectionList() if selectionList is None else selectionList
+    for node in nodes:
+        for string in selectionStrings(node):
+            try:
+                selectionList.add(string)
+            except RuntimeError:
+                pass
+    return selectionList
@@ -0,0 +1,127 @@
+from array import array
+from datetime import datetime
+
+from maya.api.OpenMaya import MGlobal, MObjectHandle
+
+from .components import createSelectionList
+
+
+def isSelectionListValid(selectionList):
+    """Return whether every node of selectionList still exists, a deleted one cannot be selected."""
+    for index in range(selectionList.length()):
+        if not MObjectHandle(selectionList.getDependNode(index)).isValid():
+            return False
+    return True
+
+
+class PathTable(object):
+    """
+    Interns node paths into integer ids shared by every history entry, so a path selected
+    in many entries is stored once. Ids are reference counted and reused once released.
+    """
+
+    def __init__(self):
+        self.ids = dict()
+        self.paths = list()
+        self.refCounts = array('l')
+        self.freeIds = list()
+
+    def __len__(self):
+        return len(self.ids)
+
+    def acquire(self, paths):
+        ids = array('l')
+        for path in paths:
+            id_ = self.ids.get(path)
+            if id_ is None:
+                if self.freeIds:
+                    id_ = self.freeIds.pop()
+                    self.paths[id_] = path
+                else:
+                    id_ = len(self.paths)
+                    self.paths.append(path)
+                    self.refCounts.append(0)
+                self.ids[path] = id_
+            self.refCounts[id_] += 1
+            ids.append(id_)
+        return ids
+
+    def release(self, ids):
+        for id_ in ids:
+            self.refCounts[id_] -= 1
+            if not self.refCounts[id_]:
+                del self.ids[self.paths[id_]]
+                self.paths[id_] = None
+                self.freeIds.append(id_)
+
+    def resolve(self, ids):
+        paths = self.paths
+        return [paths[id_] for id_ in ids]
+
+
+class HistoryEntry(object):
+
+    __slots__ = ('time', 'ids', 'selectionList')
+
+    def __init__(self, ids, selectionList=None):
+        self.time = datetime.now()
+        self.ids = ids
+        self.selectionList = selectionList
+
+    def __len__(self):
+        return len(self.ids)
+
+
+class SelectionHistory(object):
+    """
+    Ring buffer of the last maxEntries selections.
+    Only the most recent entries keep a prebuilt MSelectionList, older ones rebuild it from their paths when restored.
+    """
+
+    def __init__(self, maxEntries=100, maxSelectionLists=20):
+        self.maxEntries = maxEntries
+        self.maxSelectionLists = maxSelectionLists
+        self.entries = list()  # oldest first
+        self.paths = PathTable()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def add(self, selection, selectionList=None):
+        """Store selection and return the new entry along with the entries dropped to stay within maxEntries."""
+        entry = HistoryEntry(self.paths.acquire(selection), selectionList)
+        self.entries.append(entry)
+
+        # only the newest maxSelectionLists entries hold a list, restore does not keep one on older entries
+        if len(self.entries) > self.maxSelectionLists:
+            self.entries[-self.maxSelectionLists - 1].selectionList = None
+
+        dropped = self.entries[:-self.maxEntries] if len(self.entries) > self.maxEntries else list()
+        for droppedEntry in dropped:
+            self.paths.release(droppedEntry.ids)
+        del self.entries[:len(dropped)]
+
+        return entry, dropped
+
+    def nodes(self, entry):
+        return self.paths.resolve(entry.ids)
+
+    def label(self, entry, maxNames=10):
+        names = [path.split('|')[-1] for path in self.paths.resolve(entry.ids[:maxNames])]
+        if len(entry) > maxNames:
+            names.append('...')
+        return ', '.join(names)
+
+    def restore(self, entry):
+        selectionList = entry.selectionList
+        if selectionList is None or not isSelectionListValid(selectionList):
+            # paths of deleted nodes are skipped, the entry only keeps the list while it is one of the newest
+            selectionList = createSelectionList(self.nodes(entry))
+            entry.selectionList = selectionList if entry in self.entries[-self.maxSelectionLists:] else None
+
+        MGlobal.selectCommand(selectionList, MGlobal.kReplaceList)
+
+    def clear(self):
+        for entry in self.entries:
+            self.paths.release(entry.ids)
+        self.entries = list()
@@ -0,0 +1,226 @@
+from collections import OrderedDict
+
+from maya import cmds
+from maya.api.OpenMaya import MSelectionList, MFnDependencyNode, MFnDagNode, MFn, MObject, MObjectHandle, \
+    MDGMessage, MNodeMessage, MDagMessage, MSceneMessage
+
+from .callbacks import MessageCallbacks
+from .components import componentNode
+
+
+def resolveNodeInfo(obj, fnNode, fnDag):
+    fnNode.setObject(obj)
+    nodeType = fnNode.typeName
+    isReferenced = fnNode.isFromReferencedFile
+
+    shapeType = None
+    if nodeType != 'objectSet' and obj.hasFn(MFn.kDagNode):
+        fnDag.setObject(obj)
+        for childIndex in range(fnDag.childCount()):
+            child = fnDag.child(childIndex)
+            if child.hasFn(MFn.kShape):
+                fnNode.setObject(child)
+                shapeType = fnNode.typeName
+                break
+
+    return nodeType, shapeType or nodeType, isReferenced
+
+
+def nodeName(obj):
+    """Return the long name of a node, as listed in the selection."""
+    if obj.hasFn(MFn.kDagNode):
+        return MFnDagNode(obj).fullPathName()
+    return MFnDependencyNode(obj).name()
+
+
+def resolveNodeInfos(nodes):
+    """
+    Resolve (nodeType, iconType, isReferenced) for every node in one pass, without going through the cache.
+    iconType is the type of the first shape below a transform, the node type otherwise.
+    """
+    infos = list()
+    selectionList = MSelectionList()
+    fnNode = MFnDependencyNode()
+    fnDag = MFnDagNode()
+
+    for longName in nodes:
+        selectionList.clear()
+        try:
+            selectionList.add(longName)
+        except RuntimeError:
+            infos.append((None, None, False))
+            continue
+
+        infos.append(resolveNodeInfo(selectionList.getDependNode(0), fnNode, fnDag))
+
+    return infos
+
+
+class NodeInfoCache(MessageCallbacks):
+    """
+    Node metadata keyed by MObjectHandle hash so it survives renames and reselection.
+    Entries are dropped by Maya messages when the node is removed, renamed or reparented,
+    and everything is dropped when a reference is loaded or unloaded or the scene changes.
+    Callbacks are installed by the first query and removed once the last user releases the cache.
+    listeners are called with the long names of the nodes whose entry was dropped, None once every entry was.
+    """
+
+    def __init__(self, maxSize=200000):
+        super(NodeInfoCache, self).__init__()
+        self.maxSize = maxSize
+        self.entries = OrderedDict()  # hashCode: [handle, info, isShape, isController]
+
+        self.hits = 0
+        self.misses = 0
+
+        self.users = 0
+        self.listeners = list()
+
+    def acquire(self, listener=None):
+        self.users += 1
+        if listener is not None and listener not in self.listeners:
+            self.listeners.append(listener)
+
+    def release(self, listener=None):
+        if listener in self.listeners:
+            self.listeners.remove(listener)
+
+        self.users = max(0, self.users - 1)
+        if not self.users:
+            self.removeCallbacks()
+            self.clear()
+
+    def addNodeCallbacks(self):
+        return [
+            MDGMessage.addNodeRemovedCallback(self.nodeChanged, 'dependNode'),
+            MNodeMessage.addNameChangedCallback(MObject.kNullObj, self.nodeChanged),
+            MDagMessage.addParentAddedCallback(self.parentChanged),
+            MDagMessage.addParentRemovedCallback(self.parentChanged),
+        ]
+
+    def addSceneCallbacks(self):
+        return super(NodeInfoCache, self).addSceneCallbacks() + [
+            MSceneMessage.addCallback(MSceneMessage.kAfterLoadReference, self.clear),
+            MSceneMessage.addCallback(MSceneMessage.kAfterUnloadReference, self.clear),
+        ]
+
+    def installCallbacks(self):
+        # the node callbacks dropped with the previous scene are installed again by the next query
+        self.installNodeCallbacks()
+        self.installSceneCallbacks()
+
+    def nodeChanged(self, node, *args):
+        self.invalidate(node)
+
+    def parentChanged(self, child, parent, *args):
+        self.invalidate(child.node())
+        if parent.isValid():
+            self.invalidate(parent.node())
+
+    def invalidate(self, node):
+        if self.entries.pop(MObjectHandle(node).hashCode(), None) is not None and self.listeners:
+            self.notify({nodeName(node)})
+
+    def clear(self, *args):
+        self.entries.clear()
+        self.notify(None)
+
+    def notify(self, nodes):
+        for listener in list(self.listeners):
+            listener(nodes)
+
+    def stats(self):
+        return {'size': len(self.entries), 'maxSize': self.maxSize, 'hits': self.hits, 'misses': self.misses}
+
+    def entry(self, obj, fnNode, fnDag):
+        handle = MObjectHandle(obj)
+        key = handle.hashCode()
+
+        # hash codes are not unique, an entry of another node sharing the hash is replaced
+        entry = self.entries.pop(key, None)
+        if entry is not None and entry[0].isValid() and entry[0] == handle:
+            self.hits += 1
+        else:
+            self.misses += 1
+            entry = [handle, resolveNodeInfo(obj, fnNode, fnDag), obj.hasFn(MFn.kShape), None]
+
+        self.entries[key] = entry
+        return entry
+
+    def trim(self):
+        while len(self.entries) > self.maxSize:
+            self.entries.popitem(last=False)
+
+    def infos(self, nodes):
+        self.installCallbacks()
+
+        infos = list()
+        selectionList = MSelectionList()
+        fnNode = MFnDependencyNode()
+        fnDag = MFnDagNode()
+
+        for longName in nodes:
+            selectionList.clear()
+            try:
+                selectionList.add(longName)
+            except RuntimeError:
+                infos.append((None, None, False))
+                continue
+
+            infos.append(self.entry(selectionList.getDependNode(0), fnNode, fnDag)[1])
+
+        self.trim()
+        return infos
+
+    def flags(self, node):
+        """Return (isShape, isController) for a single node."""
+        self.installCallbacks()
+
+        selectionList = MSelectionList()
+        selectionList.add(node)
+        entry = self.entry(selectionList.getDependNode(0), MFnDependencyNode(), MFnDagNode())
+
+        if entry[3] is None:
+            entry[3] = bool(cmds.controller(node, q=True, isController=True))
+
+        self.trim()
+        return entry[2], entry[3]
+
+
+nodeInfoCache = NodeInfoCache()
+
+
+def queryNodeInfos(nodes):
+    """Return (nodeType, iconType, isReferenced) for every node, from the cache when possible."""
+    return nodeInfoCache.infos(nodes)
+
+
+def querySelectionGroups(entries):
+    """
+    Return selection entries, as merged by compactSelection, grouped by the (nodeType, namespace, isReferenced) of
+    their node. Types and reference states come from two ls queries over the nodes instead of one query per node.
+    """
+    if not entries:
+        # ls without nodes would list the whole scene
+        return dict()
+
+    nodes = list(set(componentNode(entry) for entry in entries))
+    typedNodes = cmds.ls(nodes, long=True, showType=True) or list()
+    nodeTypes = dict(zip(typedNodes[::2], typedNodes[1::2]))
+    referencedNodes = set(cmds.ls(nodes, long=True, referencedNodes=True) or list())
+
+    groups = dict()
+    for entry in entries:
+        node = componentNode(entry)
+        nodeType = nodeTypes.get(node)
+        if nodeType is None:
+            continue
+
+        namespace = node.split('|')[-1].rpartition(':')[0]
+        key = (nodeType, namespace, node in referencedNodes)
+        groupEntries = groups.get(key)
+        if groupEntries is None:
+            groupEntries = groups[key] = list()
+        groupEntries.append(entry)
+
+    return groups
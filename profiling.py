@@ -0,0 +1,192 @@
+import os
+import sys
+import time
+from collections import deque
+
+from maya import cmds
+from maya.api.OpenMaya import MGlobal
+
+
+class Stat(object):
+    """Rolling durations and Maya command counts of one timed section or command."""
+
+    __slots__ = ('count', 'total', 'durations', 'commands')
+
+    def __init__(self, window):
+        self.count = 0
+        self.total = 0.0
+        self.durations = deque(maxlen=window)
+        self.commands = deque(maxlen=window)
+
+    def add(self, duration, commands=0):
+        self.count += 1
+        self.total += duration
+        self.durations.append(duration)
+        self.commands.append(commands)
+
+    def summary(self):
+        durations = self.durations
+        return {
+            'count': self.count,
+            'total': self.total,
+            'last': durations[-1] if durations else 0.0,
+            'mean': sum(durations) / len(durations) if durations else 0.0,
+            'max': max(durations) if durations else 0.0,
+            'commands': self.commands[-1] if self.commands else 0,
+        }
+
+
+class Section(object):
+
+    __slots__ = ('profiler', 'name', 'start', 'commandCount')
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.commandCount = self.profiler.commandCount
+        self.start = time.time()
+        return self
+
+    def __exit__(self, *args):
+        duration = time.time() - self.start
+        self.profiler.addSection(self.name, duration, self.profiler.commandCount - self.commandCount)
+
+
+class NullSection(object):
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+
+class CommandTracer(object):
+    """
+    Stands in for maya.cmds or MGlobal while profiling, every command is counted and timed.
+    Other attributes, such as the MGlobal constants, are passed through.
+    """
+
+    def __init__(self, profiler, module, prefix=''):
+        self.profiler = profiler
+        self.module = module
+        self.prefix = prefix
+        self.wrappers = dict()
+
+    def __getattr__(self, name):
+        wrapper = self.wrappers.get(name)
+        if wrapper is None:
+            func = getattr(self.module, name)
+            if not callable(func):
+                return func
+
+            profiler = self.profiler
+            commandName = self.prefix + name
+
+            def wrapper(*args, **kwargs):
+                start = time.time()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    profiler.addCommand(commandName, time.time() - start)
+
+            self.wrappers[name] = wrapper
+        return wrapper
+
+
+class Profiler(object):
+    """
+    Opt-in instrumentation of the editor. While enabled, the cmds and MGlobal of every module of this package
+    are swapped for CommandTracers and timed sections (reload, load, paint...) are recorded.
+    Disabled, sections are a shared no-op and cmds and MGlobal are untouched.
+    MSelectionList calls, which also reach Maya, are not counted.
+    """
+
+    def __init__(self, window=100):
+        self.window = window
+        self.enabled = False
+        self.log = False
+
+        self.sections = dict()
+        self.commands = dict()
+        self.commandCount = 0
+
+        self.nullSection = NullSection()
+        self.listeners = list()
+
+    def packageModules(self):
+        packageName = __name__.rpartition('.')[0]
+        prefix = '{}.'.format(packageName) if packageName else None
+        for name, module in list(sys.modules.items()):
+            if module is not None and prefix and name.startswith(prefix) and name != __name__:
+                yield module
+
+    def enable(self, log=False):
+        self.enabled = True
+        self.log = log
+
+        tracers = (('cmds', CommandTracer(self, cmds)), ('MGlobal', CommandTracer(self, MGlobal, 'MGlobal.')))
+        for module in self.packageModules():
+            for attribute, tracer in tracers:
+                if getattr(module, attribute, None) is tracer.module:
+                    setattr(module, attribute, tracer)
+
+    def disable(self):
+        self.enabled = False
+
+        for module in self.packageModules():
+            for attribute in ('cmds', 'MGlobal'):
+                tracer = getattr(module, attribute, None)
+                if isinstance(tracer, CommandTracer):
+                    setattr(module, attribute, tracer.module)
+
+    def reset(self):
+        self.sections = dict()
+        self.commands = dict()
+        self.commandCount = 0
+
+    def timed(self, name):
+        return Section(self, name) if self.enabled else self.nullSection
+
+    def addSection(self, name, duration, commands):
+        stat = self.sections.get(name)
+        if stat is None:
+            stat = self.sections[name] = Stat(self.window)
+        stat.add(duration, commands)
+
+        if self.log:
+            sys.stdout.write('# selectionEditor: {} {:.2f}ms ({} cmds)\n'.format(name, duration * 1000, commands))
+        for listener in self.listeners:
+            listener(name)
+
+    def addCommand(self, name, duration):
+        self.commandCount += 1
+        stat = self.commands.get(name)
+        if stat is None:
+            stat = self.commands[name] = Stat(self.window)
+        stat.add(duration)
+
+    def stats(self):
+        return {
+            'sections': dict((name, stat.summary()) for name, stat in self.sections.items()),
+            'commands': dict((name, stat.summary()) for name, stat in self.commands.items()),
+        }
+
+    def report(self):
+        lines = list()
+        for title, stats in (('section', self.sections), ('command', self.commands)):
+            for name, stat in sorted(stats.items(), key=lambda item: -item[1].total):
+                summary = stat.summary()
+                lines.append('{:<8} {:<24} x{:<6} last {:8.2f}ms  mean {:8.2f}ms  max {:8.2f}ms'.format(
+                    title, name, summary['count'], summary['last'] * 1000, summary['mean'] * 1000,
+                    summary['max'] * 1000
+                ))
+        return '\n'.join(lines)
+
+
+profiler = Profiler()
+
+if os.environ.get('SELECTION_EDITOR_PROFILE'):
+    profiler.enable(log=True)
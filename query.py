@@ -0,0 +1,110 @@
+import fnmatch
+import re
+
+from maya import cmds
+
+from .sceneIndex import idsToBits, bitsToIds
+
+
+class SelectionQuery(object):
+    """
+    Select by name and type filter parsed once from text like 'ctrl_*, !*_end, #joint, !#nurbsCurve'.
+    Entries are comma separated, '#' marks a type and '!' excludes.
+    """
+
+    def __init__(self, names=None, excludedNames=None, types=None, excludedTypes=None):
+        self.names = list(names or list())
+        self.excludedNames = list(excludedNames or list())
+        self.types = list(types or list())
+        self.excludedTypes = list(excludedTypes or list())
+
+    @classmethod
+    def parse(cls, text):
+        query = cls()
+
+        for input_ in text.split(','):
+            flt = input_.strip()
+            isType = '#' in flt
+            isExcluded = '!' in flt
+            flt = flt.replace('#', '').replace('!', '')
+            if not flt:
+                continue
+
+            if isType:
+                filters = query.excludedTypes if isExcluded else query.types
+            else:
+                filters = query.excludedNames if isExcluded else query.names
+            filters.append(flt)
+
+        return query
+
+    def isEmpty(self):
+        return not (self.names or self.types)
+
+    def excludedNamesPattern(self):
+        if not self.excludedNames:
+            return None
+        return re.compile('|'.join(fnmatch.translate(name) for name in self.excludedNames))
+
+    @staticmethod
+    def matchName(pattern, longName):
+        name = longName.split('|')[-1]
+        return bool(pattern.match(name) or pattern.match(name.split(':')[-1]))
+
+    def run(self):
+        """
+        Return the matching nodes as long names.
+        Types are pushed into the name query so Maya filters them itself and exclusions
+        only narrow that result instead of scanning the scene again.
+        """
+        if self.isEmpty():
+            return list()
+
+        if self.names and self.types:
+            nodes = cmds.ls(*self.names, type=self.types, recursive=True, long=True)
+        elif self.names:
+            nodes = cmds.ls(*self.names, recursive=True, long=True)
+        else:
+            nodes = cmds.ls(type=self.types, recursive=True, long=True)
+
+        if nodes and self.excludedTypes:
+            excluded = set(cmds.ls(nodes, type=self.excludedTypes, long=True))
+            nodes = [node for node in nodes if node not in excluded]
+
+        pattern = self.excludedNamesPattern()
+        if nodes and pattern:
+            nodes = [node for node in nodes if not self.matchName(pattern, node)]
+
+        return nodes
+
+    def matchBits(self, index):
+        """
+        Return the nodes matching the query as a bitset of the ids of a SceneIndex.
+        Matches are combined with integer bit operations rather than sets of ids.
+        """
+        if self.isEmpty():
+            return 0
+
+        bits = None
+        if self.names:
+            bits = 0
+            for name in self.names:
+                bits |= idsToBits(index.matchName(name))
+
+        if self.types:
+            typeBits = 0
+            for nodeType in self.types:
+                typeBits |= idsToBits(index.matchType(nodeType))
+            bits = typeBits if bits is None else bits & typeBits
+
+        for nodeType in self.excludedTypes:
+            bits &= ~idsToBits(index.matchType(nodeType))
+
+        for name in self.excludedNames:
+            bits &= ~idsToBits(index.matchName(name))
+
+        return bits
+
+    def matchIndex(self, index):
+        """Return the sorted ids of the nodes matching the query, answered from a SceneIndex."""
+        return bitsToIds(self.matchBits(index))
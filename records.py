@@ -0,0 +1,197 @@
+from array import array
+
+from .components import componentNode, componentCount
+from .metadata import queryNodeInfos
+
+
+RESOLVED = 1
+REFERENCED = 2
+
+
+class StringTable(object):
+    """Interns strings as integer codes shared by every record store, code 0 is the empty string."""
+
+    __slots__ = ('codes', 'strings')
+
+    def __init__(self):
+        self.codes = {'': 0}
+        self.strings = ['']
+
+    def __len__(self):
+        return len(self.strings)
+
+    def code(self, string):
+        code = self.codes.get(string)
+        if code is None:
+            code = self.codes[string] = len(self.strings)
+            self.strings.append(string)
+        return code
+
+
+namespaceTable = StringTable()
+typeTable = StringTable()
+
+
+def splitName(longName, count=None):
+    """
+    Return (name, namespace, shortName) of a node or component entry, namespace keeps its trailing ':'.
+    Components merged from several ranges are shortened to their type and count, which is parsed from the ranges
+    unless given.
+    """
+    node, _, component = longName.partition('.')
+    name = node.split('|')[-1]
+    namespace, _, shortName = name.rpartition(':')
+    namespace = '{}:'.format(namespace) if namespace else namespace
+
+    if component:
+        name = '{}.{}'.format(name, component)
+        if ',' in component:
+            count = componentCount(longName) if count is None else count
+            shortName = '{}.{} ({})'.format(shortName, component.partition('[')[0], count)
+        else:
+            shortName = '{}.{}'.format(shortName, component)
+
+    return name, namespace, shortName
+
+
+def namespaceCode(longName):
+    namespace = longName.partition('.')[0].split('|')[-1].rpartition(':')[0]
+    return namespaceTable.code('{}:'.format(namespace) if namespace else namespace)
+
+
+class NodeRecord(object):
+    """Read only view of one node of a NodeRecords store."""
+
+    __slots__ = ('records', 'index')
+
+    def __init__(self, records, index):
+        self.records = records
+        self.index = index
+
+    @property
+    def node(self):
+        return self.records.nodes[self.index]
+
+    @property
+    def name(self):
+        return splitName(self.node, self.records.componentCounts[self.index])[0]
+
+    @property
+    def shortName(self):
+        return splitName(self.node, self.records.componentCounts[self.index])[2]
+
+    @property
+    def namespace(self):
+        return namespaceTable.strings[self.records.namespaceCodes[self.index]]
+
+    @property
+    def isResolved(self):
+        return bool(self.records.flags[self.index] & RESOLVED)
+
+    @property
+    def nodeType(self):
+        return typeTable.strings[self.records.typeCodes[self.index]] or None
+
+    @property
+    def iconType(self):
+        return typeTable.strings[self.records.iconTypeCodes[self.index]] or None
+
+    @property
+    def isReferenced(self):
+        return bool(self.records.flags[self.index] & REFERENCED)
+
+
+class NodeRecords(object):
+    """
+    Column oriented store of the nodes shown by a list. Besides the node names, every column is an array of
+    namespace and type codes interned in tables shared by every store, or of RESOLVED and REFERENCED flags.
+    Types are only known once resolve queried them, until then rows only hold their names.
+    Merged component entries also keep their component count, so their ranges are only parsed once.
+    """
+
+    __slots__ = ('nodes', 'namespaceCodes', 'componentCounts', 'typeCodes', 'iconTypeCodes', 'flags')
+
+    def __init__(self, nodes=()):
+        self.nodes = list()
+        self.namespaceCodes = array('i')
+        self.componentCounts = array('i')
+        self.typeCodes = array('i')
+        self.iconTypeCodes = array('i')
+        self.flags = array('B')
+        self.extend(nodes)
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def copy(self):
+        records = NodeRecords()
+        records.nodes = list(self.nodes)
+        records.namespaceCodes = array('i', self.namespaceCodes)
+        records.componentCounts = array('i', self.componentCounts)
+        records.typeCodes = array('i', self.typeCodes)
+        records.iconTypeCodes = array('i', self.iconTypeCodes)
+        records.flags = array('B', self.flags)
+        return records
+
+    def extend(self, nodes):
+        self.insert(len(self.nodes), nodes)
+
+    def insert(self, index, nodes):
+        nodes = list(nodes)
+        count = len(nodes)
+        self.nodes[index:index] = nodes
+        self.namespaceCodes[index:index] = array('i', [namespaceCode(node) for node in nodes])
+        # node names never hold a ',', only component entries merged from several ranges do
+        self.componentCounts[index:index] = array('i', [componentCount(node) if ',' in node else 0 for node in nodes])
+        self.typeCodes[index:index] = array('i', [0]) * count
+        self.iconTypeCodes[index:index] = array('i', [0]) * count
+        self.flags[index:index] = array('B', [0]) * count
+
+    def delete(self, start, stop):
+        del self.nodes[start:stop]
+        del self.namespaceCodes[start:stop]
+        del self.componentCounts[start:stop]
+        del self.typeCodes[start:stop]
+        del self.iconTypeCodes[start:stop]
+        del self.flags[start:stop]
+
+    def reorder(self, order):
+        """Move the records so that the new index i holds the record previously at order[i]."""
+        self.nodes = [self.nodes[index] for index in order]
+        self.namespaceCodes = array('i', [self.namespaceCodes[index] for index in order])
+        self.componentCounts = array('i', [self.componentCounts[index] for index in order])
+        self.typeCodes = array('i', [self.typeCodes[index] for index in order])
+        self.iconTypeCodes = array('i', [self.iconTypeCodes[index] for index in order])
+        self.flags = array('B', [self.flags[index] for index in order])
+
+    def unresolve(self, nodes=None):
+        """
+        Mark the records of the given nodes, of every node when None, as not resolved so their types are queried
+        again. Return the indices of the records of the nodes, unresolved already or not, since every list sharing the
+        records has to repaint them while only the first one clears their flags.
+        """
+        if nodes is None:
+            indices = list(range(len(self.nodes)))
+        else:
+            indices = [index for index, node in enumerate(self.nodes) if componentNode(node) in nodes]
+
+        flags = self.flags
+        for index in indices:
+            flags[index] = 0
+        return indices
+
+    def resolve(self, indices):
+        """Query the types and reference state of the given records in one batch, return the indices resolved."""
+        flags = self.flags
+        pending = [index for index in indices if not flags[index] & RESOLVED]
+        if not pending:
+            return pending
+
+        nodes = self.nodes
+        infos = queryNodeInfos([componentNode(nodes[index]) for index in pending])
+        for index, (nodeType, iconType, isReferenced) in zip(pending, infos):
+            self.typeCodes[index] = typeTable.code(nodeType or '')
+            self.iconTypeCodes[index] = typeTable.code(iconType or '')
+            flags[index] = (RESOLVED | REFERENCED) if isReferenced else RESOLVED
+
+        return pending
@@ -0,0 +1,334 @@
+import binascii
+import bisect
+import fnmatch
+import re
+
+from maya import cmds
+from maya.api.OpenMaya import MItDependencyNodes, MFnDependencyNode, MObject, MObjectHandle, \
+    MSelectionList, MGlobal, MDGMessage, MNodeMessage, MSceneMessage
+
+from .callbacks import MessageCallbacks
+from .components import createSelectionList
+
+
+# bit positions set in each byte value
+BYTE_BITS = tuple(tuple(bit for bit in range(8) if byte >> bit & 1) for byte in range(256))
+
+
+def splitNamespace(name):
+    nameSplit = name.split(':')
+    return ':'.join(nameSplit[:-1]), nameSplit[-1]
+
+
+def hasWildcard(pattern):
+    return any(c in pattern for c in '*?[')
+
+
+def idsToBits(ids):
+    """Return ids as an integer bitset, bit i is set for id i. Bitsets are combined with |, & and & ~."""
+    ids = list(ids)
+    if not ids:
+        return 0
+
+    data = bytearray((max(ids) >> 3) + 1)
+    for id_ in ids:
+        data[id_ >> 3] |= 1 << (id_ & 7)
+    data.reverse()
+    return int(binascii.hexlify(data), 16)
+
+
+def bitsToIds(bits):
+    """Return the sorted ids set in an integer bitset."""
+    if not bits:
+        return list()
+
+    hexBits = '{:x}'.format(bits)
+    data = bytearray(binascii.unhexlify('0' * (len(hexBits) % 2) + hexBits))
+    data.reverse()
+
+    ids = list()
+    for byteIndex, byte in enumerate(data):
+        if byte:
+            offset = byteIndex << 3
+            ids.extend(offset + bit for bit in BYTE_BITS[byte])
+    return ids
+
+
+def hasComponent(selectionList, index):
+    try:
+        return not selectionList.getComponent(index)[1].isNull()
+    except TypeError:
+        # neither a dag node nor a component
+        return False
+
+
+class SceneIndex(MessageCallbacks):
+    """
+    Short names, namespaces and types of every node in the scene, each node under an integer id.
+    Built once with a single dependency node iteration and then kept current by node added,
+    removed and renamed messages, so name and type lookups do not have to go through cmds.ls.
+    """
+
+    def __init__(self):
+        super(SceneIndex, self).__init__()
+        self.handles = list()  # id: MObjectHandle, None once the node is removed
+        self.names = list()  # id: name without namespace
+        self.namespaces = list()  # id: namespace
+        self.types = list()  # id: node type
+
+        self.ids = dict()  # MObjectHandle hash: id, list of ids for nodes sharing a hash
+        self.nameIds = dict()  # name: set of ids
+        self.fullNameIds = dict()  # namespace:name: set of ids
+        self.typeIds = dict()  # type: set of ids
+        self.derivedTypes = dict()  # type: types deriving from it
+
+        self.sortedNames = None
+        self.sortedFullNames = None
+
+        self.count = 0
+
+        self.isBuilt = False
+        self.users = 0
+
+    def __len__(self):
+        return self.count
+
+    def fullName(self, id_):
+        namespace = self.namespaces[id_]
+        return '{}:{}'.format(namespace, self.names[id_]) if namespace else self.names[id_]
+
+    def build(self):
+        self.clear()
+
+        fnNode = MFnDependencyNode()
+        iterator = MItDependencyNodes()
+        while not iterator.isDone():
+            obj = iterator.thisNode()
+            fnNode.setObject(obj)
+            self.add(obj, fnNode.name(), fnNode.typeName)
+            iterator.next()
+
+        self.isBuilt = True
+        self.installNodeCallbacks()
+
+    def acquire(self):
+        """Build the index for its first user, it is kept current until the last one releases it."""
+        self.users += 1
+        if not self.isBuilt:
+            self.build()
+        self.installSceneCallbacks()
+
+    def release(self):
+        self.users = max(0, self.users - 1)
+        if not self.users:
+            self.removeCallbacks()
+            self.clear()
+
+    def clear(self, *args):
+        self.handles = list()
+        self.names = list()
+        self.namespaces = list()
+        self.types = list()
+        self.ids = dict()
+        self.nameIds = dict()
+        self.fullNameIds = dict()
+        self.typeIds = dict()
+        self.sortedNames = None
+        self.sortedFullNames = None
+        self.count = 0
+        self.isBuilt = False
+
+    def nodeId(self, obj):
+        """Return the id of a node, None when it is not indexed."""
+        handle = MObjectHandle(obj)
+        ids = self.ids.get(handle.hashCode())
+        if ids is None:
+            return None
+
+        # hash codes are not unique, nodes sharing one are told apart by their handle
+        if not isinstance(ids, list):
+            return ids if self.handles[ids] == handle else None
+        for id_ in ids:
+            if self.handles[id_] == handle:
+                return id_
+        return None
+
+    def linkHandle(self, handle, id_):
+        key = handle.hashCode()
+        ids = self.ids.get(key)
+        if ids is None:
+            self.ids[key] = id_
+        elif isinstance(ids, list):
+            ids.append(id_)
+        else:
+            self.ids[key] = [ids, id_]
+        self.count += 1
+
+    def unlinkHandle(self, handle, id_):
+        key = handle.hashCode()
+        ids = self.ids[key]
+        if isinstance(ids, list):
+            ids.remove(id_)
+            if len(ids) == 1:
+                self.ids[key] = ids[0]
+        else:
+            del self.ids[key]
+        self.count -= 1
+
+    def add(self, obj, name, nodeType):
+        handle = MObjectHandle(obj)
+        id_ = len(self.handles)
+        namespace, shortName = splitNamespace(name)
+
+        self.handles.append(handle)
+        self.names.append(shortName)
+        self.namespaces.append(namespace)
+        self.types.append(nodeType)
+
+        self.linkHandle(handle, id_)
+        self.nameIds.setdefault(shortName, set()).add(id_)
+        self.fullNameIds.setdefault(name, set()).add(id_)
+        self.typeIds.setdefault(nodeType, set()).add(id_)
+
+        self.sortedNames = None
+        self.sortedFullNames = None
+        return id_
+
+    def unlinkName(self, id_):
+        self.nameIds[self.names[id_]].discard(id_)
+        self.fullNameIds[self.fullName(id_)].discard(id_)
+        self.sortedNames = None
+        self.sortedFullNames = None
+
+    # messages
+    def addNodeCallbacks(self):
+        return [
+            MDGMessage.addNodeAddedCallback(self.nodeAdded, 'dependNode'),
+            MDGMessage.addNodeRemovedCallback(self.nodeRemoved, 'dependNode'),
+            MNodeMessage.addNameChangedCallback(MObject.kNullObj, self.nameChanged),
+        ]
+
+    def addSceneCallbacks(self):
+        # the index is rebuilt once the next scene is loaded, which is cheaper than going through nodeAdded
+        return super(SceneIndex, self).addSceneCallbacks() + [
+            MSceneMessage.addCallback(MSceneMessage.kAfterNew, self.sceneChanged),
+            MSceneMessage.addCallback(MSceneMessage.kAfterOpen, self.sceneChanged),
+        ]
+
+    def sceneChanged(self, *args):
+        # the scene callbacks stay installed, only the node callbacks were dropped
+        self.build()
+
+    def nodeAdded(self, obj, *args):
+        fnNode = MFnDependencyNode(obj)
+        self.add(obj, fnNode.name(), fnNode.typeName)
+
+    def nodeRemoved(self, obj, *args):
+        id_ = self.nodeId(obj)
+        if id_ is None:
+            return
+
+        self.unlinkHandle(self.handles[id_], id_)
+        self.unlinkName(id_)
+        self.typeIds[self.types[id_]].discard(id_)
+        self.handles[id_] = None
+
+    def nameChanged(self, obj, previousName, *args):
+        id_ = self.nodeId(obj)
+        if id_ is None:
+            return
+
+        self.unlinkName(id_)
+        name = MFnDependencyNode(obj).name()
+        namespace, shortName = splitNamespace(name)
+        self.names[id_] = shortName
+        self.namespaces[id_] = namespace
+        self.nameIds.setdefault(shortName, set()).add(id_)
+        self.fullNameIds.setdefault(name, set()).add(id_)
+
+    # lookups
+    def matchName(self, pattern):
+        """
+        Return the ids whose name matches a wildcard pattern.
+        Like cmds.ls(recursive=True), patterns without a namespace match names in any namespace.
+        """
+        pattern = pattern.split('|')[-1]
+        if ':' in pattern:
+            idsByName = self.fullNameIds
+            if self.sortedFullNames is None:
+                self.sortedFullNames = sorted(name for name, ids in idsByName.items() if ids)
+            sortedNames = self.sortedFullNames
+        else:
+            idsByName = self.nameIds
+            if self.sortedNames is None:
+                self.sortedNames = sorted(name for name, ids in idsByName.items() if ids)
+            sortedNames = self.sortedNames
+
+        if not hasWildcard(pattern):
+            return set(idsByName.get(pattern, ()))
+
+        ids = set()
+        prefix = re.split(r'[*?\[]', pattern, 1)[0]
+
+        # only names sharing the literal prefix can match
+        start = bisect.bisect_left(sortedNames, prefix)
+        end = bisect.bisect_left(sortedNames, prefix + u'\uffff') if prefix else len(sortedNames)
+
+        if pattern == prefix + '*':
+            for name in sortedNames[start:end]:
+                ids.update(idsByName[name])
+            return ids
+
+        regex = re.compile(fnmatch.translate(pattern))
+        for name in sortedNames[start:end]:
+            if regex.match(name):
+                ids.update(idsByName[name])
+        return ids
+
+    def matchType(self, nodeType):
+        """Return the ids of nodes of nodeType or of a type deriving from it, like cmds.ls(type=...)."""
+        derivedTypes = self.derivedTypes.get(nodeType)
+        if derivedTypes is None:
+            try:
+                derivedTypes = cmds.nodeType(nodeType, derived=True, isTypeName=True) or [nodeType]
+            except RuntimeError:
+                # unknown type, e.g. while it is still being typed, not cached since a plugin may register it later
+                return set()
+            self.derivedTypes[nodeType] = derivedTypes
+
+        ids = set()
+        for derivedType in derivedTypes:
+            ids.update(self.typeIds.get(derivedType, ()))
+        return ids
+
+    def selectionListBits(self, selectionList):
+        """
+        Return the ids of the nodes of selectionList as a bitset. Components are skipped, their node is not
+        selected itself.
+        """
+        ids = list()
+        for index in range(selectionList.length()):
+            if hasComponent(selectionList, index):
+                continue
+            id_ = self.nodeId(selectionList.getDependNode(index))
+            if id_ is not None:
+                ids.append(id_)
+        return idsToBits(ids)
+
+    def nodeBits(self, nodes):
+        """Return the ids of nodes given by name as a bitset, nodes no longer in the scene are skipped."""
+        return self.selectionListBits(createSelectionList(nodes))
+
+    def selectionBits(self):
+        return self.selectionListBits(MGlobal.getActiveSelectionList())
+
+    def selectionList(self, ids):
+        selectionList = MSelectionList()
+        for id_ in ids:
+            handle = self.handles[id_]
+            if handle is not None and handle.isValid():
+                selectionList.add(handle.object())
+        return selectionList
+
+
+sceneIndex = SceneIndex()
@@ -0,0 +1,120 @@
+import time
+from collections import OrderedDict
+
+from PySide2.QtCore import QTimer
+
+from maya import cmds
+
+
+class Task(object):
+    """
+    Work split into chunks by a generator, each step runs it until its next yield.
+    Generators may yield their progress between 0 and 1. A step raising an error ends the task, keeping the error.
+    """
+
+    __slots__ = ('name', 'generator', 'progress', 'isDone', 'isCancelled', 'isRunning', 'error')
+
+    def __init__(self, name, generator):
+        self.name = name
+        self.generator = generator
+        self.progress = 0.0
+        self.isDone = False
+        self.isCancelled = False
+        self.isRunning = False
+        self.error = None
+
+    def step(self):
+        self.isRunning = True
+        try:
+            progress = next(self.generator)
+        except StopIteration:
+            self.isDone = True
+            self.progress = 1.0
+            return
+        except Exception as e:
+            self.isDone = True
+            self.error = e
+            return
+        finally:
+            self.isRunning = False
+
+        if progress is not None:
+            self.progress = min(1.0, float(progress))
+
+    def cancel(self):
+        self.isCancelled = True
+        # a task cancelled from its own step, e.g. by the callbacks of a command it runs, is closed by the scheduler
+        if not self.isRunning:
+            self.generator.close()
+
+
+class Scheduler(object):
+    """
+    Runs tasks a step at a time from the Qt event loop, spending at most budget seconds per tick so Maya keeps
+    redrawing while the editor catches up. Adding a task cancels the unfinished task of the same name, a newer
+    selection replaces the work of the previous one.
+    listeners are called with the running tasks once per tick.
+    """
+
+    def __init__(self, budget=.01):
+        self.budget = budget
+        self.tasks = OrderedDict()
+        self.listeners = list()
+        self.timer = None
+
+    def add(self, name, generator):
+        self.cancel(name)
+
+        task = Task(name, generator)
+        self.tasks[name] = task
+
+        if self.timer is None:
+            self.timer = QTimer()
+            self.timer.setSingleShot(True)
+            self.timer.timeout.connect(self.tick)
+        if not self.timer.isActive():
+            self.timer.start(0)
+
+        return task
+
+    def cancel(self, name):
+        task = self.tasks.pop(name, None)
+        if task is not None:
+            task.cancel()
+            self.notify()
+
+    def finish(self, name):
+        """Run the remaining steps of a task right away."""
+        task = self.tasks.get(name)
+        while task is not None and not task.isDone and not task.isCancelled:
+            self.step(task)
+
+    def step(self, task):
+        task.step()
+
+        if task.error is not None:
+            # reported instead of raised, the other tasks keep running
+            cmds.warning('Selection Editor task {} failed: {}'.format(task.name, task.error))
+        if task.isCancelled:
+            task.generator.close()
+        if (task.isDone or task.isCancelled) and self.tasks.get(task.name) is task:
+            del self.tasks[task.name]
+
+    def tick(self):
+        deadline = time.time() + self.budget
+        while self.tasks and time.time() < deadline:
+            for task in list(self.tasks.values()):
+                if not task.isCancelled:
+                    self.step(task)
+
+        self.notify()
+        if self.tasks:
+            self.timer.start(0)
+
+    def notify(self):
+        tasks = list(self.tasks.values())
+        for listener in list(self.listeners):
+            listener(tasks)
+
+
+scheduler = Scheduler()
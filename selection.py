@@ -0,0 +1,228 @@
+from PySide2.QtCore import QTimer
+
+from maya import cmds
+from maya.api.OpenMaya import MSelectionList, MGlobal, MEventMessage, MMessage
+
+from .components import createSelectionList
+from .sceneIndex import sceneIndex, bitsToIds
+
+
+REPLACE = 'replace'
+ADD = 'add'
+SUBTRACT = 'subtract'
+INTERSECT = 'intersect'
+TOGGLE = 'toggle'
+SELECTION_MODES = (REPLACE, ADD, SUBTRACT, INTERSECT, TOGGLE)
+
+
+def selectInChunks(nodes, chunkSize=2000):
+    """
+    Generator for the scheduler adding chunkSize nodes at a time to a selection list, which is then selected with a
+    single MGlobal.selectCommand. It yields its progress.
+    """
+    selectionList = MSelectionList()
+    for start in range(0, len(nodes), chunkSize):
+        createSelectionList(nodes[start:start + chunkSize], selectionList)
+        yield float(start + chunkSize) / len(nodes)
+
+    MGlobal.selectCommand(selectionList, MGlobal.kReplaceList)
+
+
+def combineSelection(bits, mode, componentList=None):
+    """
+    Combine the nodes of bits, a bitset of scene index ids, with the scene selection according to mode and apply the
+    result with a single MGlobal.selectCommand. The set algebra runs on bitsets, only the nodes the command has to
+    change are turned into a selection list. Components of componentList follow the mode, intersect leaves them as
+    they are. Replacing the selection needs no set algebra, it is not a mode combineSelection accepts.
+    The scene index must be acquired.
+    """
+    if mode == ADD:
+        changed, listAdjustment = bits & ~sceneIndex.selectionBits(), MGlobal.kAddToList
+    elif mode == SUBTRACT:
+        changed, listAdjustment = bits & sceneIndex.selectionBits(), MGlobal.kRemoveFromList
+    elif mode == INTERSECT:
+        changed, listAdjustment = sceneIndex.selectionBits() & ~bits, MGlobal.kRemoveFromList
+    elif mode == TOGGLE:
+        changed, listAdjustment = bits, MGlobal.kXORWithList
+    else:
+        raise ValueError('Unsupported selection mode: {}'.format(mode))
+
+    selectionList = sceneIndex.selectionList(bitsToIds(changed))
+    if componentList is not None and mode != INTERSECT:
+        selectionList.merge(componentList)
+
+    if selectionList.isEmpty():
+        return
+    MGlobal.selectCommand(selectionList, listAdjustment)
+
+
+def selectNodes(nodes, mode):
+    """
+    Combine nodes and components given by name with the scene selection. While the scene index is built the nodes
+    are combined as bitsets, see combineSelection, otherwise Maya merges the selection lists so the index is not
+    built for a single selection.
+    """
+    if mode != REPLACE and sceneIndex.isBuilt:
+        components = [node for node in nodes if '.' in node]
+        bits = sceneIndex.nodeBits(node for node in nodes if '.' not in node)
+        combineSelection(bits, mode, createSelectionList(components) if components else None)
+        return
+
+    selectionList = createSelectionList(nodes)
+    if mode == REPLACE:
+        listAdjustment = MGlobal.kReplaceList
+    elif mode == ADD:
+        listAdjustment = MGlobal.kAddToList
+    elif mode == SUBTRACT:
+        listAdjustment = MGlobal.kRemoveFromList
+    elif mode == INTERSECT:
+        # what is selected but not listed is removed
+        activeList = MGlobal.getActiveSelectionList()
+        activeList.merge(selectionList, MSelectionList.kRemoveFromList)
+        selectionList, listAdjustment = activeList, MGlobal.kRemoveFromList
+    elif mode == TOGGLE:
+        listAdjustment = MGlobal.kXORWithList
+    else:
+        raise ValueError('Unknown selection mode: {}'.format(mode))
+
+    if mode != REPLACE and selectionList.isEmpty():
+        return
+    MGlobal.selectCommand(selectionList, listAdjustment)
+
+
+class SelectionSnapshot(object):
+    """
+    Node records shared by every list showing them, they must never be modified in place
+    apart from their types being resolved.
+    Users acquire the snapshot while they show it and release it once closed.
+    """
+
+    __slots__ = ('records', 'users')
+
+    def __init__(self, records):
+        self.records = records
+        self.users = 0
+
+    def acquire(self):
+        self.users += 1
+        return self
+
+    def release(self):
+        self.users = max(0, self.users - 1)
+
+
+class SelectionHub(object):
+    """
+    Owns the single SelectionChanged callback shared by every editor and tear-off.
+    eventListeners are called on each event, before anything is queried. SelectionChanged events are then
+    coalesced into one query per interval (0 means the next idle tick) and every listener receives the same
+    selection, as a tuple since it is shared.
+    """
+
+    def __init__(self):
+        self.listeners = list()
+        self.eventListeners = list()
+        self.selection = tuple()
+        self.interval = 0
+        self.callbackId = None
+        self.timer = None
+
+    def subscribe(self, listener=None, eventListener=None):
+        if listener is not None and listener not in self.listeners:
+            self.listeners.append(listener)
+        if eventListener is not None and eventListener not in self.eventListeners:
+            self.eventListeners.append(eventListener)
+        self.start()
+
+    def unsubscribe(self, listener=None, eventListener=None):
+        if listener in self.listeners:
+            self.listeners.remove(listener)
+        if eventListener in self.eventListeners:
+            self.eventListeners.remove(eventListener)
+        if not self.listeners and not self.eventListeners:
+            self.stop()
+
+    def start(self):
+        if self.timer is None:
+            self.timer = QTimer()
+            self.timer.setSingleShot(True)
+            self.timer.timeout.connect(self.update)
+
+        if self.callbackId is None:
+            self.callbackId = MEventMessage.addEventCallback('SelectionChanged', self.selectionChanged)
+            self.selection = tuple()
+
+    def stop(self):
+        if self.timer is not None:
+            self.timer.stop()
+
+        if self.callbackId is not None:
+            try:
+                MMessage.removeCallback(self.callbackId)
+            except RuntimeError:
+                pass
+        self.callbackId = None
+
+    def selectionChanged(self, *args, **kwargs):
+        for listener in list(self.eventListeners):
+            listener()
+
+        if self.listeners and not self.timer.isActive():
+            self.timer.start(self.interval)
+
+    def update(self):
+        self.selection = tuple(cmds.ls(sl=True, long=True) or ())
+
+        for listener in list(self.listeners):
+            listener(self.selection)
+
+
+selectionHub = SelectionHub()
+
+
+class SelectionPush(object):
+    """
+    Pushes list selection changes to the scene. While the scene selection is the one last pushed, only the added and
+    removed nodes are sent, toggled with a single MGlobal.selectCommand.
+    Once the scene selection is changed by something else the next push replaces it with every selected node.
+    """
+
+    def __init__(self):
+        self.isSynced = False
+        self.pushing = False
+        self.started = False
+
+    def start(self):
+        selectionHub.subscribe(eventListener=self.selectionChanged)
+        self.started = True
+
+    def stop(self):
+        selectionHub.unsubscribe(eventListener=self.selectionChanged)
+        self.started = False
+        self.isSynced = False
+
+    def selectionChanged(self):
+        if not self.pushing:
+            self.isSynced = False
+
+    def push(self, selectedNodes, added=None, removed=None):
+        """
+        Select the nodes returned by selectedNodes, added and removed are the changes since the previous push.
+        selectedNodes is only called when the whole selection has to be sent.
+        """
+        if not self.isSynced or not self.started or added is None or removed is None:
+            selectionList = createSelectionList(selectedNodes())
+            listAdjustment = MGlobal.kReplaceList
+        else:
+            # added nodes are not selected and removed ones are, toggling both applies the change
+            selectionList = createSelectionList(added + removed)
+            listAdjustment = MGlobal.kXORWithList
+            if selectionList.isEmpty():
+                return
+
+        self.pushing = True
+        try:
+            MGlobal.selectCommand(selectionList, listAdjustment)
+        finally:
+            self.pushing = False
+        self.isSynced = True
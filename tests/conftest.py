@@ -0,0 +1,9 @@
+import pytest
+
+from standIn import fakeMaya, createScene
+
+
+@pytest.fixture
+def scene():
+    yield createScene()
+    fakeMaya.scene.clear()
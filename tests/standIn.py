@@ -0,0 +1,38 @@
+"""
+Runs the package against the stand-in Maya backend of benchmarks/fakeMaya, install happens on import.
+Modules are loaded with load, the package directory name is not fixed.
+"""
+import importlib
+import os
+import sys
+
+testsDir = os.path.dirname(os.path.abspath(__file__))
+packageDir = os.path.dirname(testsDir)
+sys.path.insert(0, os.path.dirname(packageDir))
+sys.path.insert(0, os.path.join(packageDir, 'benchmarks'))
+
+import fakeMaya
+
+fakeMaya.install()
+
+packageName = os.path.basename(packageDir)
+
+
+def load(name):
+    return importlib.import_module('{}.{}'.format(packageName, name))
+
+
+def createScene():
+    """Build a small scene: two meshes and a joint under a group, a referenced locator and an object set."""
+    scene = fakeMaya.scene
+    scene.clear()
+    scene.addNode('grp', 'transform')
+    scene.addNode('cube', 'transform', '|grp')
+    scene.addNode('cubeShape', 'mesh', '|grp|cube')
+    scene.addNode('sphere', 'transform', '|grp')
+    scene.addNode('sphereShape', 'mesh', '|grp|sphere')
+    scene.addNode('jnt_end', 'joint', '|grp')
+    scene.addNode('ns:loc', 'transform', isReferenced=True)
+    scene.addNode('ns:locShape', 'locator', '|ns:loc', isReferenced=True)
+    scene.addNode('set1', 'objectSet')
+    return scene
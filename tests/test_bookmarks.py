@@ -0,0 +1,70 @@
+import pytest
+
+from maya import cmds
+
+from standIn import load
+
+bookmarks = load('bookmarks')
+
+
+@pytest.fixture
+def userAppDir(tmp_path, monkeypatch):
+    monkeypatch.setattr(cmds, 'internalVar', lambda **kwargs: str(tmp_path) + '/')
+    return tmp_path
+
+
+@pytest.fixture
+def scenePath(monkeypatch):
+    path = ['/projects/shot.ma']
+    monkeypatch.setattr(cmds, 'file', lambda *args, **kwargs: path[0])
+    return path
+
+
+def testStoreRoundTrip(userAppDir, scenePath):
+    store = bookmarks.BookmarkStore.forScene()
+    store.add('first', ['|a', '|b.vtx[0:4,7]'])
+    store.add('second', ['|c'])
+
+    loaded = bookmarks.BookmarkStore.forScene()
+    assert [(bookmark.name, len(bookmark)) for bookmark in loaded.bookmarks] == [('first', 2), ('second', 1)]
+
+    # members are only read once needed
+    assert loaded.bookmarks[0]._nodes is None
+    assert loaded.bookmarks[0].nodes() == ['|a', '|b.vtx[0:4,7]']
+
+    loaded.remove(loaded.bookmarks[0])
+    assert [bookmark.name for bookmark in bookmarks.BookmarkStore.forScene().bookmarks] == ['second']
+
+
+def testExportImport(userAppDir, scenePath, tmp_path):
+    store = bookmarks.BookmarkStore.forScene()
+    path = str(tmp_path / 'exported.txt')
+    store.exportFile(store.add('rig', ['|a', '|b']), path)
+
+    imported = store.importFile(path)
+    assert (imported.name, imported.nodes()) == ('rig', ['|a', '|b'])
+
+
+@pytest.mark.parametrize('content', ['|a\n|b', '[1, 2]\n|a', '{"format": "other"}\n|a'])
+def testImportRejectsForeignFiles(userAppDir, scenePath, tmp_path, content):
+    path = tmp_path / 'foreign.txt'
+    path.write_text(content)
+
+    with pytest.raises(ValueError):
+        bookmarks.BookmarkStore.forScene().importFile(str(path))
+
+
+def testUntitledBookmarksMoveToTheSavedScene(userAppDir, scenePath):
+    scenePath[0] = ''
+    untitled = bookmarks.BookmarkStore.forScene()
+    untitled.add('draft', ['|a'])
+    assert not list(userAppDir.iterdir())
+    assert bookmarks.BookmarkStore.forScene(unsaved=untitled) is untitled
+
+    # another untitled scene does not see them
+    assert not bookmarks.BookmarkStore.forScene().bookmarks
+
+    scenePath[0] = '/projects/shot.ma'
+    saved = bookmarks.BookmarkStore.forScene(unsaved=untitled)
+    assert [(bookmark.name, bookmark.nodes()) for bookmark in saved.bookmarks] == [('draft', ['|a'])]
+    assert [bookmark.name for bookmark in bookmarks.BookmarkStore.forScene().bookmarks] == ['draft']
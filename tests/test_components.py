@@ -0,0 +1,47 @@
+from standIn import load
+
+components = load('components')
+
+
+def testRangeListMergesOverlappingAndAdjacentRanges():
+    rangeList = components.RangeList()
+    for start, stop in ((0, 2), (10, 10), (3, 4), (6, 8), (5, 5), (12, 14)):
+        rangeList.add(start, stop)
+
+    assert rangeList.ranges() == [(0, 8), (10, 10), (12, 14)]
+    assert len(rangeList) == 13
+    assert str(rangeList) == '0:8,10,12:14'
+
+
+def testRangeListParseRoundTrip():
+    rangeList = components.RangeList.parse('0:4,7,9:10')
+    assert rangeList.ranges() == [(0, 4), (7, 7), (9, 10)]
+    assert str(components.RangeList.parse(str(rangeList))) == str(rangeList)
+
+
+def testCompactSelectionMergesSingleIndexComponents():
+    selection = ['|a', '|b.vtx[0:4]', '|b.vtx[10]', '|a.e[2]', '|b.vtx[5]', '|c.cv[0:3][1]']
+    entries, count = components.compactSelection(selection)
+
+    assert entries == ['|a', '|b.vtx[0:5,10]', '|a.e[2]', '|c.cv[0:3][1]']
+    assert count == 1 + 7 + 1 + 4
+
+
+def testComponentCount():
+    assert components.componentCount('|a') == 1
+    assert components.componentCount('|a.vtx[0:5,10]') == 7
+    assert components.componentCount('|a.cv[0:3][0:1]') == 8
+    assert components.componentCount('|a.rotatePivot') == 1
+
+
+def testSelectionStringsSplitMergedRanges():
+    assert components.selectionStrings('|a') == ['|a']
+    assert components.selectionStrings('|a.vtx[0:4]') == ['|a.vtx[0:4]']
+    assert components.selectionStrings('|a.vtx[0:4,7]') == ['|a.vtx[0:4]', '|a.vtx[7]']
+
+
+def testCreateSelectionListSkipsMissingNodes(scene):
+    selectionList = components.createSelectionList(['|grp|cube', '|missing', '|grp|cube|cubeShape.vtx[0:1,3]'])
+    assert selectionList.getSelectionStrings() == [
+        '|grp|cube', '|grp|cube|cubeShape.vtx[0:1]', '|grp|cube|cubeShape.vtx[3]'
+    ]
@@ -0,0 +1,62 @@
+from maya.api.OpenMaya import MGlobal
+
+from standIn import load
+
+history = load('history')
+
+
+def testPathTableInternsAndReusesIds():
+    table = history.PathTable()
+    first = table.acquire(['|a', '|b'])
+    second = table.acquire(['|b', '|c'])
+
+    assert first[1] == second[0]
+    assert len(table) == 3
+    assert table.resolve(second) == ['|b', '|c']
+
+    table.release(first)
+    assert len(table) == 2
+    assert table.resolve(second) == ['|b', '|c']
+
+    # the id of the released path is reused
+    assert list(table.acquire(['|d'])) == [first[0]]
+
+
+def addSelections(scene, selectionHistory, selections):
+    for nodes in selections:
+        scene.setSelection(nodes)
+        selectionHistory.add(nodes, MGlobal.getActiveSelectionList())
+
+
+def testEntriesAndSelectionListsAreBounded(scene):
+    selectionHistory = history.SelectionHistory(maxEntries=5, maxSelectionLists=2)
+    nodes = sorted(scene.nodes)
+    addSelections(scene, selectionHistory, [[node] for node in nodes[:7]])
+
+    assert len(selectionHistory) == 5
+    assert selectionHistory.nodes(selectionHistory.entries[0]) == [nodes[2]]
+    assert len(selectionHistory.paths) == 5
+
+    # restoring old entries does not keep their rebuilt lists
+    selectionHistory.restore(selectionHistory.entries[0])
+    selectionHistory.restore(selectionHistory.entries[1])
+    assert scene.selection == [nodes[3]]
+    assert sum(entry.selectionList is not None for entry in selectionHistory.entries) == 2
+
+
+def testRestoreSkipsDeletedNodes(scene):
+    selectionHistory = history.SelectionHistory()
+    addSelections(scene, selectionHistory, [['|grp|cube', '|grp|sphere'], ['|ns:loc']])
+
+    scene.deleteNode('|grp|sphere')
+    selectionHistory.restore(selectionHistory.entries[0])
+    assert scene.selection == ['|grp|cube']
+
+
+def testClear(scene):
+    selectionHistory = history.SelectionHistory()
+    addSelections(scene, selectionHistory, [['|grp|cube'], ['|ns:loc']])
+
+    selectionHistory.clear()
+    assert len(selectionHistory) == 0
+    assert len(selectionHistory.paths) == 0
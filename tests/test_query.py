@@ -0,0 +1,36 @@
+from standIn import load
+
+query = load('query')
+sceneIndex = load('sceneIndex')
+
+SelectionQuery = query.SelectionQuery
+
+
+def testParse():
+    parsed = SelectionQuery.parse('cube*, !*_end, #joint, !#mesh, ,')
+    assert parsed.names == ['cube*']
+    assert parsed.excludedNames == ['*_end']
+    assert parsed.types == ['joint']
+    assert parsed.excludedTypes == ['mesh']
+    assert SelectionQuery.parse(' , !#mesh').isEmpty()
+
+
+def testRun(scene):
+    assert SelectionQuery.parse('*Shape').run() == [
+        '|grp|cube|cubeShape', '|grp|sphere|sphereShape', '|ns:loc|ns:locShape'
+    ]
+    assert SelectionQuery.parse('*Shape, !#mesh').run() == ['|ns:loc|ns:locShape']
+    assert SelectionQuery.parse('#transform, !*_end, !ns:*').run() == ['|grp', '|grp|cube', '|grp|sphere']
+    assert SelectionQuery.parse('!cube').run() == []
+
+
+def testMatchBitsAgreesWithRun(scene):
+    index = sceneIndex.SceneIndex()
+    index.build()
+    try:
+        for text in ('*Shape', '*Shape, !#mesh', '#transform, !*_end', 's*, #mesh', 'loc', '#joint'):
+            parsed = SelectionQuery.parse(text)
+            matched = sorted(index.fullName(id_) for id_ in parsed.matchIndex(index))
+            assert matched == sorted(node.split('|')[-1] for node in parsed.run()), text
+    finally:
+        index.removeCallbacks()
@@ -0,0 +1,26 @@
+from standIn import load
+
+records = load('records')
+
+
+def testSplitName():
+    assert records.splitName('|grp|ns:cube') == ('ns:cube', 'ns:', 'cube')
+    assert records.splitName('|ns:cube.vtx[3]') == ('ns:cube.vtx[3]', 'ns:', 'cube.vtx[3]')
+    assert records.splitName('|ns:cube.vtx[0:5,10]') == ('ns:cube.vtx[0:5,10]', 'ns:', 'cube.vtx (7)')
+
+
+def testResolveAndUnresolve(scene):
+    store = records.NodeRecords(['|grp|cube', '|ns:loc', '|grp|cube|cubeShape.vtx[0:1,4]', '|missing'])
+    assert store.resolve(range(4)) == [0, 1, 2, 3]
+    assert store.resolve(range(4)) == []
+
+    record = records.NodeRecord(store, 1)
+    assert (record.nodeType, record.iconType, record.isReferenced) == ('transform', 'locator', True)
+    assert records.NodeRecord(store, 2).iconType == 'mesh'
+    assert records.NodeRecord(store, 3).nodeType is None
+
+    # every list sharing the records gets the rows back, resolved or not
+    assert store.unresolve({'|grp|cube'}) == [0]
+    assert store.unresolve({'|grp|cube'}) == [0]
+    assert store.unresolve({'|grp|cube|cubeShape'}) == [2]
+    assert store.resolve(range(4)) == [0, 2]
@@ -0,0 +1,77 @@
+from maya.api.OpenMaya import MObject
+
+from standIn import load
+
+sceneIndex = load('sceneIndex')
+
+
+def testBitsRoundTrip():
+    for ids in ([], [0], [7, 8], [3, 64, 65, 1000]):
+        assert sceneIndex.bitsToIds(sceneIndex.idsToBits(ids)) == ids
+
+    assert sceneIndex.idsToBits([0, 2]) == 0b101
+
+
+def names(index, ids):
+    return sorted(index.fullName(id_) for id_ in ids)
+
+
+def testMatchNameAndType(scene):
+    index = sceneIndex.SceneIndex()
+    index.build()
+    try:
+        assert len(index) == len(scene.nodes)
+        assert names(index, index.matchName('*Shape')) == ['cubeShape', 'ns:locShape', 'sphereShape']
+        assert names(index, index.matchName('loc')) == ['ns:loc']
+        assert names(index, index.matchName('ns:loc*')) == ['ns:loc', 'ns:locShape']
+        assert names(index, index.matchType('transform')) == ['cube', 'grp', 'jnt_end', 'ns:loc', 'sphere']
+        assert index.matchType('notAType') == set()
+    finally:
+        index.removeCallbacks()
+
+
+def testFollowsNodeMessages(scene):
+    index = sceneIndex.SceneIndex()
+    index.build()
+    try:
+        scene.renameNode('|grp|cube', 'box')
+        assert names(index, index.matchName('box')) == ['box']
+        assert not index.matchName('cube')
+
+        scene.deleteNode('|grp|sphere')
+        assert not index.matchName('sphere*')
+        assert len(index) == len(scene.nodes)
+
+        scene.addNode('torus', 'transform')
+        assert names(index, index.matchName('torus')) == ['torus']
+    finally:
+        index.removeCallbacks()
+
+
+def testNodesSharingAHashKeepTheirIds(scene):
+    first = scene.nodes['|grp|cube']
+    second = scene.nodes['|grp|sphere']
+    second.handle = first.handle
+
+    index = sceneIndex.SceneIndex()
+    index.build()
+    try:
+        firstId = index.nodeId(MObject(first))
+        secondId = index.nodeId(MObject(second))
+        assert firstId != secondId
+        assert index.fullName(secondId) == 'sphere'
+
+        scene.deleteNode('|grp|cube')
+        assert index.nodeId(MObject(second)) == secondId
+    finally:
+        index.removeCallbacks()
+
+
+def testSelectionBitsSkipComponents(scene):
+    index = sceneIndex.SceneIndex()
+    index.build()
+    try:
+        scene.setSelection(['|grp|cube|cubeShape.vtx[0]', '|grp|sphere', 'set1'])
+        assert names(index, sceneIndex.bitsToIds(index.selectionBits())) == ['set1', 'sphere']
+    finally:
+        index.removeCallbacks()
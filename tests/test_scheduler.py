@@ -0,0 +1,47 @@
+from standIn import load
+
+scheduler = load('scheduler')
+
+
+def chunks(results, count):
+    for index in range(count):
+        results.append(index)
+        yield float(index + 1) / count
+
+
+def failing():
+    yield .5
+    raise RuntimeError('select failed')
+
+
+def testFinishRunsRemainingSteps():
+    tasks = scheduler.Scheduler()
+    results = list()
+    task = tasks.add('load', chunks(results, 3))
+
+    tasks.finish('load')
+    assert results == [0, 1, 2]
+    assert task.isDone and task.progress == 1.0
+    assert not tasks.tasks
+
+
+def testAddingCancelsTheTaskOfTheSameName():
+    tasks = scheduler.Scheduler()
+    first = tasks.add('select', chunks(list(), 3))
+    tasks.add('select', chunks(list(), 3))
+
+    assert first.isCancelled
+    assert len(tasks.tasks) == 1
+
+
+def testFailingTaskIsReportedAndRemoved(capsys):
+    tasks = scheduler.Scheduler()
+    results = list()
+    task = tasks.add('select', failing())
+    tasks.add('load', chunks(results, 2))
+
+    tasks.tick()
+    assert task.isDone and isinstance(task.error, RuntimeError)
+    assert 'select failed' in capsys.readouterr().out
+    assert results == [0, 1]
+    assert not tasks.tasks
@@ -0,0 +1,93 @@
+import pytest
+
+from standIn import fakeMaya, load
+
+selection = load('selection')
+sceneIndex = load('sceneIndex')
+
+
+@pytest.fixture
+def index(scene):
+    sceneIndex.sceneIndex.acquire()
+    yield sceneIndex.sceneIndex
+    sceneIndex.sceneIndex.release()
+
+
+@pytest.mark.parametrize('mode, nodes, expected', [
+    (selection.ADD, ['|grp|sphere', '|grp|cube'], ['|grp|cube', '|grp|cube|cubeShape.vtx[0]', '|grp|sphere']),
+    (selection.SUBTRACT, ['|grp|sphere', '|grp|cube'], ['|grp|cube|cubeShape.vtx[0]']),
+    (selection.INTERSECT, ['|grp|sphere'], ['|grp|cube|cubeShape.vtx[0]']),
+    (selection.TOGGLE, ['|grp|sphere', '|grp|cube'], ['|grp|cube|cubeShape.vtx[0]', '|grp|sphere']),
+])
+def testCombineSelection(index, mode, nodes, expected):
+    # components are left alone, their shape is not selected itself
+    fakeMaya.scene.setSelection(['|grp|cube', '|grp|cube|cubeShape.vtx[0]'])
+    selection.combineSelection(index.nodeBits(nodes), mode)
+    assert sorted(fakeMaya.scene.selection) == expected
+
+
+def testCombineSelectionAddsShapeWithSelectedComponents(index):
+    fakeMaya.scene.setSelection(['|grp|cube|cubeShape.vtx[0]'])
+    selection.combineSelection(index.nodeBits(['|grp|cube|cubeShape']), selection.ADD)
+    assert fakeMaya.scene.selection == ['|grp|cube|cubeShape.vtx[0]', '|grp|cube|cubeShape']
+
+
+def testCombineSelectionRejectsReplace(index):
+    with pytest.raises(ValueError):
+        selection.combineSelection(0, selection.REPLACE)
+
+
+@pytest.mark.parametrize('withIndex', [False, True])
+@pytest.mark.parametrize('mode, expected', [
+    (selection.REPLACE, ['|grp|cube', '|grp|sphere', '|ns:loc']),
+    (selection.ADD, ['|grp', '|grp|cube', '|grp|sphere', '|ns:loc']),
+    (selection.SUBTRACT, ['|grp']),
+    (selection.INTERSECT, ['|grp|cube']),
+    (selection.TOGGLE, ['|grp', '|grp|sphere', '|ns:loc']),
+])
+def testSelectNodes(scene, withIndex, mode, expected):
+    if withIndex:
+        sceneIndex.sceneIndex.acquire()
+    try:
+        scene.setSelection(['|grp', '|grp|cube'])
+        selection.selectNodes(['|grp|cube', '|grp|sphere', '|ns:loc', '|missing'], mode)
+        assert sorted(scene.selection) == expected
+    finally:
+        if withIndex:
+            sceneIndex.sceneIndex.release()
+
+
+def testSelectInChunks(scene):
+    nodes = ['|grp|cube', '|grp|sphere', '|missing', '|ns:loc', '|grp|cube|cubeShape.vtx[1,3]']
+    progress = list(selection.selectInChunks(nodes, chunkSize=2))
+
+    assert progress == [.4, .8, 1.2]
+    assert scene.selection == [
+        '|grp|cube', '|grp|sphere', '|ns:loc', '|grp|cube|cubeShape.vtx[1]', '|grp|cube|cubeShape.vtx[3]'
+    ]
+
+
+def testSelectionPushSendsDeltasWhileSynced(scene):
+    push = selection.SelectionPush()
+    push.start()
+    try:
+        selected = ['|grp|cube']
+        push.push(lambda: selected, ['|grp|cube'], [])
+        assert scene.selection == ['|grp|cube']
+
+        # only the changes are toggled while the scene selection is the pushed one
+        scene.calls = 0
+        selected = ['|grp|cube', '|grp|sphere']
+        push.push(lambda: pytest.fail('the whole selection is not needed'), ['|grp|sphere'], [])
+        assert scene.selection == selected
+
+        push.push(lambda: pytest.fail('the whole selection is not needed'), [], ['|grp|cube'])
+        assert scene.selection == ['|grp|sphere']
+
+        # another change to the scene selection makes the next push replace it
+        scene.setSelection(['|ns:loc'])
+        selected = ['|grp|sphere', '|grp|cube']
+        push.push(lambda: selected, ['|grp|cube'], [])
+        assert scene.selection == selected
+    finally:
+        push.stop()
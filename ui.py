@@ -1,25 +1,48 @@
 import time
-from datetime import datetime
-import webbrowser
 
-from PySide2.QtSvg import QSvgRenderer
+importStart = time.time()
 
-from PySide2.QtCore import Qt, QSize, QRect, QPoint
-from PySide2.QtGui import QIcon, QPixmap, QColor, QPainter, QImage, QMouseEvent, QFont, QFontMetrics, QPen, QBrush
-from PySide2.QtWidgets import QMainWindow, QHBoxLayout, QVBoxLayout, QPushButton, QGridLayout, QColorDialog, \
-    QComboBox, QLabel, QDoubleSpinBox, QDialog, QCheckBox, QFrame, QApplication, QLineEdit, QFileDialog, QMenuBar, \
-    QMenu, QAction, QTreeWidget, QTreeWidgetItem, QTreeWidgetItemIterator, QTabWidget, QWidget, QListWidget, \
-    QListWidgetItem, QScrollBar
+import sys
+from collections import OrderedDict
+from functools import partial
+
+from PySide2.QtCore import Qt, QSize, QPoint, QAbstractListModel, QModelIndex, Signal, QTimer
+from PySide2.QtGui import QPixmap, QColor, QPainter, QImage, QMouseEvent, QFont, QFontMetrics, QPen, QStaticText, \
+    QTransform, QIcon
+from PySide2.QtWidgets import QMainWindow, QHBoxLayout, QVBoxLayout, QLabel, QDialog, QFrame, QApplication, \
+    QLineEdit, QFileDialog, QMenuBar, QMenu, QAction, QTreeWidget, QTreeWidgetItem, QTabWidget, QWidget, QListView, \
+    QStyledItemDelegate, QStyle, QInputDialog, QStackedWidget, QProgressBar, QActionGroup
 from maya import OpenMayaUI, cmds
 import shiboken2
-from functools import partial
-import json
-import os
-from maya.api.OpenMaya import MMatrix, MEventMessage
-from maya.app.general.mayaMixin import MayaQWidgetDockableMixin
+from maya.api.OpenMaya import MGlobal, MSceneMessage, MMessage
+
+from .metadata import queryNodeInfos, nodeInfoCache, querySelectionGroups
+from .query import SelectionQuery
+from .sceneIndex import sceneIndex
+from .history import SelectionHistory
+from .bookmarks import BookmarkStore
+from .selection import SelectionPush, SelectionSnapshot, selectionHub, selectInChunks, combineSelection, selectNodes, \
+    REPLACE, ADD, SUBTRACT, INTERSECT, TOGGLE, SELECTION_MODES
+from .components import compactSelection, componentCount
+from .records import NodeRecords, NodeRecord, splitName
+from .scheduler import scheduler
+from .profiling import profiler
+
+
+# seconds, exceeding them is reported when the editor is shown
+IMPORT_TIME_BUDGET = .1
+FIRST_SHOW_TIME_BUDGET = .5
+
+startupTimes = dict()
 
+_dpiFactor = None
 
-dpiF = QApplication.desktop().logicalDpiX() / 96.0
+
+def getDpiFactor():
+    global _dpiFactor
+    if _dpiFactor is None:
+        _dpiFactor = QApplication.desktop().logicalDpiX() / 96.0
+    return _dpiFactor
 
 
 def getMayaMainWindow():
@@ -38,14 +61,122 @@ def clamp(minimum, val, maximum):
     return max(minimum, min(val, maximum))
 
 
+def groupRuns(indices):
+    """Group sorted indices into (first, last) runs of consecutive values."""
+    runs = list()
+    for index in indices:
+        if runs and runs[-1][1] == index - 1:
+            runs[-1][1] = index
+        else:
+            runs.append([index, index])
+    return [tuple(run) for run in runs]
+
+
 class SelectByNameLine(QLineEdit):
 
+    matchesChanged = Signal(int)
+
     def __init__(self, *args, **kwargs):
         super(SelectByNameLine, self).__init__(*args, **kwargs)
 
         self.history = list()
         self.index = -1
 
+        # live preview answered from the scene index while typing
+        self.livePreview = False
+        self.previewSize = 20
+        self.textChanged.connect(self.updatePreview)
+
+        # how matches are combined with the scene selection
+        self.mode = REPLACE
+
+        self.isShown = False
+        self.hasSceneIndex = False
+
+    def updateSceneIndex(self):
+        """
+        Hold the scene index while the line is shown and live preview or a mode other than replace uses it,
+        hiding the editor releases it but keeps both settings.
+        """
+        needsIndex = self.isShown and (self.livePreview or self.mode != REPLACE)
+        if needsIndex == self.hasSceneIndex:
+            return
+
+        if needsIndex:
+            sceneIndex.acquire()
+        else:
+            sceneIndex.release()
+        self.hasSceneIndex = needsIndex
+
+    def showEvent(self, *args, **kwargs):
+        self.isShown = True
+        self.updateSceneIndex()
+        self.updatePreview()
+        super(SelectByNameLine, self).showEvent(*args, **kwargs)
+
+    def hideEvent(self, *args, **kwargs):
+        self.isShown = False
+        self.updateSceneIndex()
+        super(SelectByNameLine, self).hideEvent(*args, **kwargs)
+
+    def setLivePreview(self, state):
+        if state == self.livePreview:
+            return
+
+        self.livePreview = state
+        self.updateSceneIndex()
+        if state:
+            self.updatePreview()
+        else:
+            self.setToolTip('')
+            self.matchesChanged.emit(-1)
+
+    def setMode(self, mode, *args):
+        """Modes other than replace combine matches on scene index ids, the index is kept while they are used."""
+        if mode == self.mode:
+            return
+
+        self.mode = mode
+        self.updateSceneIndex()
+
+    def updatePreview(self, *args, **kwargs):
+        if not self.livePreview or not self.hasSceneIndex:
+            return
+
+        query = SelectionQuery.parse(self.text())
+        if query.isEmpty():
+            self.setToolTip('')
+            self.matchesChanged.emit(-1)
+            return
+
+        ids = query.matchIndex(sceneIndex)
+        names = [sceneIndex.fullName(id_) for id_ in ids[:self.previewSize]]
+        if len(ids) > self.previewSize:
+            names.append('...')
+        self.setToolTip('\n'.join(names))
+        self.matchesChanged.emit(len(ids))
+
+    def contextMenuEvent(self, event):
+        menu = self.createStandardContextMenu()
+        menu.addSeparator()
+
+        livePreviewAct = menu.addAction('Live Preview')
+        livePreviewAct.setCheckable(True)
+        livePreviewAct.setChecked(self.livePreview)
+        livePreviewAct.toggled.connect(self.setLivePreview)
+
+        modeMenu = menu.addMenu('Mode')
+        modeGroup = QActionGroup(modeMenu)
+        for mode in SELECTION_MODES:
+            modeAct = modeMenu.addAction(mode.title())
+            modeAct.setCheckable(True)
+            modeAct.setChecked(mode == self.mode)
+            modeAct.triggered.connect(partial(self.setMode, mode))
+            modeGroup.addAction(modeAct)
+
+        menu.exec_(event.globalPos())
+        menu.deleteLater()
+
     def keyPressEvent(self, event):
         if event.key() == Qt.Key_Up:
             event.accept()
@@ -78,98 +209,122 @@ class SelectByNameLine(QLineEdit):
             super(SelectByNameLine, self).keyPressEvent(event)
 
     def select(self):
-        rawInput = self.text()
+        if self.mode != REPLACE:
+            # matches are combined with the scene selection as bitsets and applied with one select command
+            scheduler.cancel('select')
+            with profiler.timed('selectByName'):
+                query = SelectionQuery.parse(self.text())
+                if not query.isEmpty():
+                    combineSelection(query.matchBits(sceneIndex), self.mode)
+            return
 
-        name_filters = list()
-        inverse_name_filters = list()
+        with profiler.timed('selectByName'):
+            query = SelectionQuery.parse(self.text())
+            nodes = query.run()
 
-        type_filters = list()
-        inverse_type_filters = list()
+        # the query is a single ls, selecting its result is spread over the next ticks
+        scheduler.add('select', selectInChunks(nodes))
 
-        for input_ in rawInput.split(','):
-            flt = input_.strip()
-            if '#' in flt:
-                flt = flt.replace('#', '')
-                if '!' in flt:
-                    flt = flt.replace('!', '')
-                    inverse_type_filters.append(flt)
-                else:
-                    type_filters.append(flt)
 
-            else:
-                if '!' in flt:
-                    flt = flt.replace('!', '')
-                    inverse_name_filters.append(flt)
-                else:
-                    name_filters.append(flt)
-
-        name_filtered = cmds.ls(*name_filters, recursive=True) if name_filters else list()
-        inverse_name_filtered = cmds.ls(*inverse_name_filters, recursive=True) if inverse_name_filters else list()
-        name_set = set(name_filtered).difference(inverse_name_filtered)
-
-        type_filtered = cmds.ls(type=type_filters, recursive=True) if type_filters else list()
-        inverse_type_filtered = cmds.ls(type=inverse_type_filters, recursive=True) if inverse_type_filters else list()
-        type_set = set(type_filtered).difference(inverse_type_filtered)
-
-        if (name_filters + inverse_name_filters) and (type_filters + inverse_type_filters):
-            final_set = name_set.intersection(type_set)
-        elif (name_filters + inverse_name_filters) and not (type_filters + inverse_type_filters):
-            final_set = name_set
-        elif not (name_filters + inverse_name_filters) and (type_filters + inverse_type_filters):
-            final_set = type_set
-        else:
-            final_set = set()
+class IconCache(object):
+    """
+    Bounded cache of node icons already scaled and composited with their badges,
+    keyed by type, size, device pixel ratio and badge combination.
+    """
 
-        cmds.select(list(final_set), noExpand=True)
+    def __init__(self, maxSize=256):
+        self.maxSize = maxSize
+        self.pixmaps = OrderedDict()
+        self.typeImages = dict()
 
+    def typeImage(self, iconType):
+        img = self.typeImages.get(iconType)
+        if img is None:
+            img = QImage(':{}.svg'.format(iconType))
+            if img.isNull():
+                img = QImage(':default.svg')
+            self.typeImages[iconType] = img
+        return img
 
-class IconWidget(QWidget):
+    def icon(self, iconType, width, height, devicePixelRatio=1.0, isReferenced=False, isShape=False,
+             isController=False):
+        key = (iconType, width, height, devicePixelRatio, isReferenced, isShape, isController)
 
-    images = dict()
+        pixmap = self.pixmaps.pop(key, None)
+        if pixmap is None:
+            pixmap = self.createIcon(*key)
+        self.pixmaps[key] = pixmap
 
-    def __init__(self, node, parent):
-        super(IconWidget, self).__init__(parent)
+        while len(self.pixmaps) > self.maxSize:
+            self.pixmaps.popitem(last=False)
 
-        nodeType = cmds.objectType(node)
-        shapes = cmds.listRelatives(node, shapes=True, fullPath=True) if nodeType != 'objectSet' else None
-        shapType = cmds.objectType(shapes[0]) if shapes else None
+        return pixmap
 
-        self.type = nodeType if not shapType else shapType
-        self.isShape = cmds.objectType(node, isAType='shape')
-        self.isReferenced = cmds.referenceQuery(node, isNodeReferenced=True)
-        self.isController = cmds.controller(node, q=True, isController=True)
+    def createIcon(self, iconType, width, height, devicePixelRatio, isReferenced, isShape, isController):
+        width = int(width * devicePixelRatio)
+        height = int(height * devicePixelRatio)
+        halfWidth = width // 2
+        halfHeight = height // 2
 
-    def paintEvent(self, event):
-        painter = QPainter(self)
+        pixmap = QPixmap(width, height)
+        pixmap.fill(Qt.transparent)
+
+        painter = QPainter(pixmap)
 
         # type
-        img = QImage(':{}.svg'.format(self.type))
-        if img.isNull():
-            img = QImage(':default.svg')
-        img = img.smoothScaled(self.width(), self.height())
-        painter.drawImage(0, 0, img)
+        painter.drawImage(0, 0, self.typeImage(iconType).smoothScaled(width, height))
 
         # ref
-        if self.isReferenced:
-            refImg = QImage(':reference.svg').smoothScaled(self.width() * .5, self.height() * .5)
-            painter.drawImage(0, 0, refImg)
+        if isReferenced:
+            painter.drawImage(0, 0, self.typeImage('reference').smoothScaled(halfWidth, halfHeight))
 
         # shape
-        if self.isShape:
-            shapeImg = QImage(':nurbsSurface.svg').smoothScaled(self.width() * .5, self.height() * .5)
-            painter.drawImage(self.width() * .5, self.height() * .5, shapeImg)
+        if isShape:
+            painter.drawImage(halfWidth, halfHeight, self.typeImage('nurbsSurface').smoothScaled(halfWidth, halfHeight))
 
         # ctrl
-        if self.isController:
-            ctrlImg = QImage(':character.svg').smoothScaled(self.width() * .5, self.height() * .5)
-            painter.drawImage(self.width() * .5, 0, ctrlImg)
+        if isController:
+            painter.drawImage(halfWidth, 0, self.typeImage('character').smoothScaled(halfWidth, halfHeight))
+
+        painter.end()
+
+        pixmap.setDevicePixelRatio(devicePixelRatio)
+        return pixmap
+
+
+iconCache = IconCache()
+
+
+class IconWidget(QWidget):
+
+    def __init__(self, node, parent):
+        super(IconWidget, self).__init__(parent)
+        self.node = node
+        self.info = None
+
+    def paintEvent(self, event):
+        # queried on the first paint, widgets that are never shown cost nothing
+        if self.info is None:
+            nodeType, iconType, isReferenced = queryNodeInfos([self.node])[0]
+            self.info = (iconType, isReferenced) + nodeInfoCache.flags(self.node)
+        iconType, isReferenced, isShape, isController = self.info
+
+        painter = QPainter(self)
+
+        pixmap = iconCache.icon(
+            iconType, self.width(), self.height(), self.devicePixelRatioF(),
+            isReferenced=isReferenced, isShape=isShape, isController=isController
+        )
+        painter.drawPixmap(0, 0, pixmap)
 
         # painter.drawRect(0, 0, self.width() - 1, self.height() - 1)
 
 
 class IconButton(QWidget):
 
-    images = dict()
+    # state pixmaps shared by every button, keyed by file, size, device pixel ratio and color offset
+    images = OrderedDict()
+    maxImages = 128
 
     def __init__(self, idleImageFile, checkedImageFile=None, checkable=False, parent=None, isChecked=False):
         super(IconButton, self).__init__(parent=parent)
@@ -225,55 +380,96 @@ class IconButton(QWidget):
         else:
             super(IconButton, self).mouseReleaseEvent(event)
 
-    def offsetImageColor(self, img, offsetColor):
-        for x in range(img.width()):
-            for y in range(img.height()):
-                color = img.pixelColor(x, y)  # type: QColor
+    @staticmethod
+    def offsetImageColor(img, offsetColor):
+        """Return a copy of img with offsetColor added to every color channel, alpha is kept."""
+        img = img.convertToFormat(QImage.Format_ARGB32)
+        table = bytes(bytearray(min(value + offsetColor, 255) for value in range(256)))
+        alphaIndex = 3 if sys.byteorder == 'little' else 0
 
-                r = min(color.red() + offsetColor, 255)
-                g = min(color.green() + offsetColor, 255)
-                b = min(color.blue() + offsetColor, 255)
-                a = color.alpha()
+        pixels = bytearray(img.constBits())
+        for channel in range(4):
+            if channel != alphaIndex:
+                pixels[channel::4] = pixels[channel::4].translate(table)
 
-                img.setPixelColor(x, y, QColor(r, g, b, a))
+        return QImage(bytes(pixels), img.width(), img.height(), img.bytesPerLine(), QImage.Format_ARGB32).copy()
+
+    def statePixmap(self, imageFile, offsetColor):
+        devicePixelRatio = self.devicePixelRatioF()
+        key = (imageFile, self.width(), self.height(), devicePixelRatio, offsetColor)
+
+        pixmap = self.images.pop(key, None)
+        if pixmap is None:
+            img = QImage(imageFile).smoothScaled(
+                int(self.width() * devicePixelRatio), int(self.height() * devicePixelRatio)
+            )
+            if offsetColor and not img.isNull():
+                img = self.offsetImageColor(img, offsetColor)
+            pixmap = QPixmap.fromImage(img)
+            pixmap.setDevicePixelRatio(devicePixelRatio)
+        self.images[key] = pixmap
+
+        while len(self.images) > self.maxImages:
+            self.images.popitem(last=False)
+
+        return pixmap
 
     def paintEvent(self, event):
         painter = QPainter(self)
 
         # img
-        img = QImage(self.idleImageFile)
+        imageFile = self.idleImageFile
         if self.isCheckable and self.isChecked and self.checkedImageFile:
-            img = QImage(self.checkedImageFile)
+            imageFile = self.checkedImageFile
 
+        offsetColor = 0
         if self.isClicked:
-            self.offsetImageColor(img, self.clickedColor)
+            offsetColor = self.clickedColor
         elif self.isHovered:
-            self.offsetImageColor(img, self.hoveredColor)
+            offsetColor = self.hoveredColor
 
-        img = img.smoothScaled(self.width(), self.height())
-        painter.drawImage(0, 0, img)
+        painter.drawPixmap(0, 0, self.statePixmap(imageFile, offsetColor))
 
 
 class SelectionEditor(QDialog):   #  MayaQWidgetDockableMixin,
 
-    def __init__(self, parent=getMayaMainWindow()):
+    instance = None
+
+    def __init__(self, parent=None):
+        if parent is None:
+            parent = getMayaMainWindow()
         super(SelectionEditor, self).__init__(parent=parent)
         self.setWindowFlags(self.windowFlags() & ~Qt.WindowContextHelpButtonHint)
         self.setWindowTitle('Selection')
 
         self.selection = None
+        self.sceneSelection = None
         self.historySelection = None
         self.historyEnabled = True
         self.selectionEnabled = True
         self.namespace = True
+        self.selectionPush = SelectionPush()
 
         #
         self.selectionTree = SelectionTree()
-        self.selectionTree.itemSelectionChanged.connect(self.selectSelectionItem)
+        self.selectionTree.selectionDelta.connect(self.selectSelectionItem)
+
+        # selections above summaryThreshold are shown as groups of nodes sharing type, namespace and reference state
+        self.summaryThreshold = 10000
+        self.summarySnapshot = None
+        self.summaryTree = QTreeWidget()
+        self.summaryTree.setHeaderLabels(('type', 'namespace', 'len'))
+        self.summaryTree.setSelectionMode(QTreeWidget.ExtendedSelection)
+        self.summaryTree.itemExpanded.connect(self.expandSummaryItem)
+        self.summaryTree.itemSelectionChanged.connect(self.selectSummaryItem)
+
+        self.selectionStack = QStackedWidget()
+        self.selectionStack.addWidget(self.selectionTree)
+        self.selectionStack.addWidget(self.summaryTree)
 
         # selection count
         self.selectionCount = QLabel()
-        self.selectionCount.setToolTip('Number of Selected Objects')
+        self.selectionCount.setToolTip('Number of Selected Objects and Components')
 
         # select by name and type
         self.selectByNameTypeHistory = list()
@@ -284,9 +480,14 @@ class SelectionEditor(QDialog):   #  MayaQWidgetDockableMixin,
         selectByNameLabel.setToolTip('Select by Name and Type')
         selectByNameLabel.setPixmap(pixmap.scaled(40, 40))
 
+        self.selectByNameCount = QLabel()
+        self.selectByNameCount.setToolTip('Number of Matching Objects')
+        self.selectByNameTypeField.matchesChanged.connect(self.updateMatchCount)
+
         selectByNameTypeLayout = QHBoxLayout()
         selectByNameTypeLayout.addWidget(selectByNameLabel)
         selectByNameTypeLayout.addWidget(self.selectByNameTypeField)
+        selectByNameTypeLayout.addWidget(self.selectByNameCount)
         # selectByNameTypeLayout.addWidget(self.selectionCount)
 
         # selection tree
@@ -298,10 +499,7 @@ class SelectionEditor(QDialog):   #  MayaQWidgetDockableMixin,
         self.saveSelection = IconButton(':Bookmark.png')
         self.saveSelection.setToolTip('Save Current Selection')
         self.saveSelection.setMinimumSize(QSize(30, 30))
-        self.saveSelection.clicked.append(self.test)
-
-        self.saveWindow = QWidget(self.saveSelection)
-        self.saveWindow.setFixedSize(QSize(100, 100))
+        self.saveSelection.clicked.append(self.bookmarkSelection)
 
         copySelectionTab = IconButton(':UVTkCopySet.png')
         copySelectionTab.setToolTip('Tear Off Selection in another Window')
@@ -344,37 +542,133 @@ class SelectionEditor(QDialog):   #  MayaQWidgetDockableMixin,
 
         #
 
+        self.history = SelectionHistory()
+
         self.historyTree = QTreeWidget()
         self.historyTree.itemSelectionChanged.connect(self.selectHistoryItem)
         self.historyTree.setHeaderLabels(('time', 'len', 'content'))
+        self.historyTree.setRootIsDecorated(False)
+
+        self.bookmarks = None
 
         self.savedTree = QTreeWidget()
+        self.savedTree.setHeaderLabels(('name', 'len'))
+        self.savedTree.setRootIsDecorated(False)
+        self.savedTree.setContextMenuPolicy(Qt.CustomContextMenu)
+        self.savedTree.customContextMenuRequested.connect(self.showBookmarkMenu)
+        self.savedTree.itemDoubleClicked.connect(self.selectBookmarkItem)
+
+        self.tabs = QTabWidget()
+        self.tabs.addTab(self.selectionStack, 'Selection')
+        self.tabs.addTab(self.historyTree, 'History')
+        self.tabs.addTab(self.savedTree, 'Saved')
 
         # main layout
         mainLayout = QVBoxLayout(self)
         # mainLayout.setMargin(0)
         mainLayout.addLayout(selectByNameTypeLayout)
         mainLayout.addLayout(selectionOptionsLayout)
-        mainLayout.addWidget(self.selectionTree)
+        mainLayout.addWidget(self.tabs)
         # mainLayout.addLayout(selectionLayout)
 
+        # timings overlay, only shown while profiling
+        self.profileLabel = QLabel()
+        self.profileLabel.setToolTip('Last Reload, Load and Paint Durations (cmds and MGlobal Calls)')
+        self.profileLabel.setVisible(profiler.enabled)
+        mainLayout.addWidget(self.profileLabel)
+
+        # progress of the work the scheduler spreads over several ticks
+        self.progressBar = QProgressBar()
+        self.progressBar.setRange(0, 100)
+        self.progressBar.setTextVisible(False)
+        self.progressBar.setMaximumHeight(int(4 * getDpiFactor()))
+        self.progressBar.setVisible(False)
+        mainLayout.addWidget(self.progressBar)
+
         #
-        self.eventCallback = None
+        self.sceneCallbacks = list()
+
+        # SelectionChanged events are coalesced by the selection hub, which queries the selection once for every editor
+        self.pendingTreeReload = False
+        self.pendingHistoryEntry = False
 
+        dpiF = getDpiFactor()
         self.resize(QSize(130 * dpiF, 260 * dpiF))
 
-    def test(self):
-        if self.saveWindow.isVisible():
-            self.saveWindow.hide()
+    def loadBookmarks(self, *args, **kwargs):
+        self.setBookmarks(BookmarkStore.forScene())
+
+    def reloadBookmarks(self, *args, **kwargs):
+        # bookmarks of an untitled scene are kept while it is, and written once it is saved
+        self.setBookmarks(BookmarkStore.forScene(unsaved=self.bookmarks))
+
+    def setBookmarks(self, bookmarks):
+        self.bookmarks = bookmarks
+
+        self.savedTree.clear()
+        for bookmark in self.bookmarks.bookmarks:
+            self.addBookmarkItem(bookmark)
+
+    def addBookmarkItem(self, bookmark):
+        item = QTreeWidgetItem((bookmark.name, str(len(bookmark))))
+        item.setData(0, Qt.UserRole, bookmark)
+        self.savedTree.addTopLevelItem(item)
+        return item
+
+    def bookmarkSelection(self):
+        selection = cmds.ls(sl=True, long=True)
+        if not selection:
             return
 
-        self.saveWindow.show()
+        defaultName = 'Selection {}'.format(len(self.bookmarks.bookmarks) + 1)
+        name, ok = QInputDialog.getText(self, 'Save Current Selection', 'Name', text=defaultName)
+        if not ok or not name:
+            return
 
-        # x = self.saveSelection.x()
-        # y = self.saveSelection.y() + self.saveSelection.height()
-        #
-        # self.saveWindow.move(self.mapToGlobal(QPoint(x, y)))
-        # self.saveWindow.resize(QSize(500, 500))
+        self.addBookmarkItem(self.bookmarks.add(name, selection))
+        self.tabs.setCurrentWidget(self.savedTree)
+
+    def selectBookmarkItem(self, item, *args, **kwargs):
+        scheduler.add('select', selectInChunks(item.data(0, Qt.UserRole).nodes()))
+
+    def showBookmarkMenu(self, position):
+        item = self.savedTree.itemAt(position)
+
+        menu = QMenu(self.savedTree)
+        if item:
+            bookmark = item.data(0, Qt.UserRole)
+            menu.addAction('Select', partial(self.selectBookmarkItem, item))
+            menu.addAction('Export...', partial(self.exportBookmark, bookmark))
+            menu.addAction('Delete', partial(self.deleteBookmark, item))
+            menu.addSeparator()
+        menu.addAction('Import...', self.importBookmark)
+
+        menu.exec_(self.savedTree.viewport().mapToGlobal(position))
+        menu.deleteLater()
+
+    def exportBookmark(self, bookmark):
+        path, _ = QFileDialog.getSaveFileName(self, 'Export Bookmark', '{}.txt'.format(bookmark.name), 'Bookmark (*.txt)')
+        if path:
+            self.bookmarks.exportFile(bookmark, path)
+
+    def importBookmark(self):
+        path, _ = QFileDialog.getOpenFileName(self, 'Import Bookmark', '', 'Bookmark (*.txt)')
+        if not path:
+            return
+
+        try:
+            bookmark = self.bookmarks.importFile(path)
+        except ValueError as e:
+            cmds.warning(str(e))
+            return
+        self.addBookmarkItem(bookmark)
+
+    def deleteBookmark(self, item):
+        self.bookmarks.remove(item.data(0, Qt.UserRole))
+        self.savedTree.takeTopLevelItem(self.savedTree.indexOfTopLevelItem(item))
+
+    def updateMatchCount(self, count):
+        self.selectByNameCount.setText('<b>{}</b>'.format(count) if count >= 0 else '')
 
     def lockToggled(self, state):
         self.selectionEnabled = not state
@@ -389,79 +683,236 @@ class SelectionEditor(QDialog):   #  MayaQWidgetDockableMixin,
 
         item = items[-1]
 
-        selection = item.data(0, Qt.UserRole)
+        entry = item.data(0, Qt.UserRole)
 
         self.historyEnabled = False
-        cmds.select(selection, noExpand=True)
+        self.history.restore(entry)
         self.historyEnabled = True
 
-    def selectSelectionItem(self, *args, **kwargs):
+    def selectSelectionItem(self, added=None, removed=None):
         self.selectionEnabled = False
-        cmds.select(self.selectionTree.selectedNodes(), noExpand=True)
+        self.selectionPush.push(self.selectionTree.selectedNodes, added, removed)
+        self.selectionEnabled = True
+
+    def clearSummary(self):
+        # clearing deselects the items, which must not be pushed as an empty scene selection
+        self.summaryTree.blockSignals(True)
+        self.summaryTree.clear()
+        self.summaryTree.blockSignals(False)
+        self.summarySnapshot = None
+
+    def loadSummary(self, nodes):
+        """Show the nodes as groups, the rows of a group are only created once it is expanded."""
+        self.clearSummary()
+
+        height = self.selectionTree.delegate.iconHeight
+        items = list()
+        groups = querySelectionGroups(nodes)
+        for (nodeType, namespace, isReferenced), groupNodes in sorted(groups.items(), key=lambda group: -len(group[1])):
+            # counted like the selection count, a merged component entry counts each of its components
+            count = sum(componentCount(node) for node in groupNodes)
+            item = QTreeWidgetItem((nodeType, namespace or ':', str(count)))
+            item.setIcon(0, QIcon(iconCache.icon(nodeType, height, height, isReferenced=isReferenced)))
+            item.setToolTip(0, 'Referenced' if isReferenced else '')
+            item.setData(0, Qt.UserRole, groupNodes)
+            item.setChildIndicatorPolicy(QTreeWidgetItem.ShowIndicator)
+            items.append(item)
+        self.summaryTree.addTopLevelItems(items)
+
+    def expandSummaryItem(self, item):
+        if item.childCount() or item.parent() is not None:
+            return
+
+        children = list()
+        for node in item.data(0, Qt.UserRole):
+            child = QTreeWidgetItem((splitName(node)[2],))
+            child.setToolTip(0, node)
+            child.setData(0, Qt.UserRole, node)
+            children.append(child)
+        item.addChildren(children)
+
+    def selectSummaryItem(self):
+        nodes = list()
+        for item in self.summaryTree.selectedItems():
+            if item.parent() is None:
+                nodes.extend(item.data(0, Qt.UserRole))
+            elif not item.parent().isSelected():
+                nodes.append(item.data(0, Qt.UserRole))
+
+        self.selectionEnabled = False
+        self.selectionPush.push(lambda: nodes)
         self.selectionEnabled = True
 
     def removeCallBack(self):
+        selectionHub.unsubscribe(self.selectionUpdated, self.selectionChanged)
+
         try:
-            MEventMessage.removeCallback(self.eventCallback)
+            MMessage.removeCallbacks(self.sceneCallbacks)
         except RuntimeError:
             pass
-        except AttributeError:
-            pass
+        self.sceneCallbacks = list()
+
+        self.selectionPush.stop()
 
     def deleteLater(self, *args, **kwargs):
         self.removeCallBack()
-        self.saveWindow.deleteLater()
         super(SelectionEditor, self).deleteLater(*args, **kwargs)
 
     def closeEvent(self, *args, **kwargs):
         self.removeCallBack()
-        self.saveWindow.close()
         super(SelectionEditor, self).closeEvent(*args, **kwargs)
 
     def hideEvent(self, *args, **kwargs):
         print('hide')
         self.removeCallBack()
-        self.saveWindow.hide()
+        nodeInfoCache.release(self.selectionTree.nodeModel.invalidateRows)
+        if self.updateProfileLabel in profiler.listeners:
+            profiler.listeners.remove(self.updateProfileLabel)
+        if self.updateProgress in scheduler.listeners:
+            scheduler.listeners.remove(self.updateProgress)
         super(SelectionEditor, self).hideEvent(*args, **kwargs)
 
     def showEvent(self, *args, **kwargs):
-        self.eventCallback = MEventMessage.addEventCallback('SelectionChanged', self.reload)
+        selectionHub.subscribe(self.selectionUpdated, self.selectionChanged)
+        self.selectionPush.start()
+        nodeInfoCache.acquire(self.selectionTree.nodeModel.invalidateRows)
+        if self.updateProfileLabel not in profiler.listeners:
+            profiler.listeners.append(self.updateProfileLabel)
+        if self.updateProgress not in scheduler.listeners:
+            scheduler.listeners.append(self.updateProgress)
+        self.sceneCallbacks = [
+            MSceneMessage.addCallback(MSceneMessage.kAfterNew, self.loadBookmarks),
+            MSceneMessage.addCallback(MSceneMessage.kAfterOpen, self.loadBookmarks),
+            MSceneMessage.addCallback(MSceneMessage.kAfterSave, self.reloadBookmarks),
+        ]
+        self.sceneCallbacks.extend(
+            MSceneMessage.addCallback(message, self.clearHistory)
+            for message in (MSceneMessage.kBeforeNew, MSceneMessage.kBeforeOpen)
+        )
+        self.reloadBookmarks()
         self.reload()
         super(SelectionEditor, self).showEvent(*args, **kwargs)
 
-    def reload(self, *args, **kwargs):
-        # print('SELECTION CHANGED')
-        start = time.time()
-        selection = cmds.ls(sl=True, long=True)
+    def selectionChanged(self):
+        # flags are read now since the editor disables them only while it changes the selection itself
+        self.pendingTreeReload = self.pendingTreeReload or self.selectionEnabled
+        self.pendingHistoryEntry = self.pendingHistoryEntry or self.historyEnabled
+
+        # a newer selection replaces the one still being built
+        scheduler.cancel('select')
+
+    def updateProgress(self, tasks):
+        self.progressBar.setVisible(bool(tasks))
+        if tasks:
+            self.progressBar.setValue(int(100 * sum(task.progress for task in tasks) / len(tasks)))
 
-        self.selectionCount.setText('<b>{}</b>'.format(len(selection)))
+    def updateProfileLabel(self, *args, **kwargs):
+        self.profileLabel.setVisible(profiler.enabled)
+        if not profiler.enabled:
+            return
 
-        if selection != self.selection and self.selectionEnabled:
-            self.selectionTree.load(selection)
-            self.selection = selection
+        sections = profiler.stats()['sections']
+        texts = list()
+        for name in ('reload', 'treeReload', 'load', 'paint'):
+            if name in sections:
+                texts.append('{} {:.1f}ms ({})'.format(name, sections[name]['last'] * 1000, sections[name]['commands']))
+        self.profileLabel.setText(' | '.join(texts))
+
+    def selectionUpdated(self, selection):
+        reloadTree = self.pendingTreeReload
+        addHistory = self.pendingHistoryEntry
+        self.pendingTreeReload = False
+        self.pendingHistoryEntry = False
+        self.reload(reloadTree=reloadTree, addHistory=addHistory, selection=selection)
+
+    def reload(self, reloadTree=None, addHistory=None, selection=None):
+        reloadTree = self.selectionEnabled if reloadTree is None else reloadTree
+        addHistory = self.historyEnabled if addHistory is None else addHistory
+
+        with profiler.timed('reload'):
+            if selection is None:
+                selection = tuple(cmds.ls(sl=True, long=True) or ())
+
+            if selection == self.sceneSelection and (selection == self.selection or not reloadTree):
+                return
+            self.sceneSelection = selection
+
+            # components of a node are merged into one entry per component type, counted from their ranges
+            nodes, count = compactSelection(selection)
+
+            # painted right away, before the list catches up with a large selection
+            self.selectionCount.setText('<b>{}</b>'.format(count))
+            self.selectionCount.repaint()
+
+            if selection != self.selection and reloadTree:
+                if len(nodes) > self.summaryThreshold:
+                    self.selectionTree.load(list())
+                    self.loadSummary(nodes)
+                    self.selectionStack.setCurrentWidget(self.summaryTree)
+                else:
+                    self.clearSummary()
+                    self.selectionTree.reload(nodes)
+                    self.selectionStack.setCurrentWidget(self.selectionTree)
+                self.selection = selection
+
+            if selection and addHistory and selection != self.historySelection:
+                self.addEntryToHistory(selection)
+                self.historySelection = selection
+
+    def clearHistory(self, *args, **kwargs):
+        # entries hold paths and selection lists of the scene about to be closed
+        self.history.clear()
+        self.historySelection = None
 
-        # print('SELECTION CHANGED', time.time() - start)
-        if selection and self.historyEnabled and selection != self.historySelection:
-            self.addEntryToHistory(selection)
-            self.historySelection = selection
+        self.historyTree.blockSignals(True)
+        self.historyTree.clear()
+        self.historyTree.blockSignals(False)
 
     def addEntryToHistory(self, selection):
-        pass
-        # self.historyTree.clearSelection()
-        #
-        # currentDateAndTime = datetime.now()
-        # selectionLabel = ', '.join([i.split('|')[-1] for i in selection])
-        # item = QTreeWidgetItem((currentDateAndTime.strftime("%H:%M:%S"), str(len(selection)), selectionLabel,))
-        #
-        # item.setData(0, Qt.UserRole, selection)
-        # self.historyTree.insertTopLevelItem(0, item)
-        #
-        # self.historyEnabled = False
-        # item.setSelected(True)
-        # self.historyEnabled = True
+        entry, dropped = self.history.add(selection, MGlobal.getActiveSelectionList())
+
+        item = QTreeWidgetItem((entry.time.strftime("%H:%M:%S"), str(len(entry)), self.history.label(entry),))
+        item.setData(0, Qt.UserRole, entry)
+
+        # the entry is the current selection already, selecting its item must not restore it
+        self.historyTree.blockSignals(True)
+        self.historyTree.clearSelection()
+        self.historyTree.insertTopLevelItem(0, item)
+        for _ in dropped:
+            self.historyTree.takeTopLevelItem(self.historyTree.topLevelItemCount() - 1)
+        item.setSelected(True)
+        self.historyTree.blockSignals(False)
+
+    @classmethod
+    def showWindow(cls):
+        """Show the editor, reusing the window created by the previous call."""
+        isFirstShow = cls.instance is None or not shiboken2.isValid(cls.instance)
+        start = time.time()
+
+        if isFirstShow:
+            cls.instance = cls()
+
+        cls.instance.show()
+        cls.instance.raise_()
+        cls.instance.activateWindow()
+
+        if isFirstShow:
+            startupTimes['firstShow'] = time.time() - start
+            checkStartupTimes()
+
+        return cls.instance
 
     def tearOffSelectionCopy(self):
-        ui = TearOffSelectionWindow(self.selectionTree.nodes, parent=self)
+        if self.selectionStack.currentWidget() is self.summaryTree:
+            if self.summarySnapshot is None:
+                nodes = compactSelection(self.selection or list())[0]
+                self.summarySnapshot = SelectionSnapshot(NodeRecords(nodes))
+            snapshot = self.summarySnapshot
+        else:
+            self.selectionTree.finishLoading()
+            snapshot = self.selectionTree.nodeModel.createSnapshot()
+
+        ui = TearOffSelectionWindow(snapshot, parent=self)
         ui.show()
 
 
@@ -503,86 +954,193 @@ class SelectionEditor(QDialog):   #  MayaQWidgetDockableMixin,
 #         lay.addLayout(nameLayout)
 
 
-class SelectionTree(QListWidget):
-    def __init__(self, *args, **kwargs):
-        super(SelectionTree, self).__init__(*args, **kwargs)
-        # self.setStyleSheet('QListWidget {background: rgb(50, 50, 50);} QListWidget::item:selected {background: rgb(100, 100, 100);}')
-        self.setSelectionMode(QListWidget.ExtendedSelection)
-        self.nodes = list()
-        self.itemSelectionChanged.connect(self.selectItems)
-
-        self.displayNamespaces = True
+class SelectionModel(QAbstractListModel):
 
-    def selectItems(self):
-        selectedItems = self.selectedItems()
+    NodeRole = Qt.UserRole
+    NameRole = Qt.UserRole + 1
+    NamespaceRole = Qt.UserRole + 2
+    TypeRole = Qt.UserRole + 3
+    ReferencedRole = Qt.UserRole + 4
 
-        items = [self.item(x) for x in range(self.count())]
+    def __init__(self, parent=None):
+        super(SelectionModel, self).__init__(parent)
+        self.records = NodeRecords()
+        self.snapshot = None
 
-        for item in items:
-            wid = self.itemWidget(item)
-            if not wid:
-                continue
-            wid.isSelected = item in selectedItems
+        # nodes whose cached metadata was dropped, their rows are resolved again once painted
+        self.invalidNodes = set()
+        self.invalidTimer = QTimer(self)
+        self.invalidTimer.setSingleShot(True)
+        self.invalidTimer.timeout.connect(self.unresolveRows)
 
-    def toggleNamespaces(self, state):
-        self.displayNamespaces = state
-        items = [self.item(x) for x in range(self.count())]
+    @property
+    def nodes(self):
+        return self.records.nodes
+
+    def setRows(self, nodes):
+        self.beginResetModel()
+        self.records = NodeRecords(nodes)
+        self.snapshot = None
+        self.endResetModel()
+
+    def setSnapshot(self, snapshot):
+        """Show the records of snapshot without copying them, they are copied once they have to change."""
+        self.beginResetModel()
+        self.records = snapshot.records
+        self.snapshot = snapshot
+        self.endResetModel()
+
+    def createSnapshot(self):
+        """Return a snapshot sharing the current records, the same snapshot is returned until they change."""
+        if self.snapshot is None:
+            self.snapshot = SelectionSnapshot(self.records)
+        return self.snapshot
+
+    def detach(self):
+        # records are only copied while another list still shows the snapshot
+        if self.snapshot is not None:
+            if self.snapshot.users:
+                self.records = self.records.copy()
+            self.snapshot = None
+
+    def updateRows(self, nodes):
+        """Turn the current nodes into `nodes` by removing, moving and inserting only the rows that changed."""
+        if nodes == self.nodes:
+            return
+        self.detach()
 
-        for item in items:
-            wid = self.itemWidget(item)
-            wid.displayNamespace = state
+        count = len(self.nodes)
+        if nodes[:count] == self.nodes:
+            self.insertNodes(nodes, range(count, len(nodes)))
+            return
 
-    def selectedNodes(self):
-        return [i.data(Qt.UserRole) for i in self.selectedItems()]
+        oldSet = set(self.nodes)
+        newSet = set(nodes)
+
+        removed = [row for row, node in enumerate(self.nodes) if node not in newSet]
+        for first, last in reversed(groupRuns(removed)):
+            self.beginRemoveRows(QModelIndex(), first, last)
+            self.records.delete(first, last + 1)
+            self.endRemoveRows()
+
+        kept = [node for node in nodes if node in oldSet]
+        if kept != self.nodes:
+            self.reorderRows(kept)
+
+        added = [row for row, node in enumerate(nodes) if node not in oldSet]
+        self.insertNodes(nodes, added)
+
+    def appendRows(self, nodes):
+        self.detach()
+        count = len(self.nodes)
+        self.beginInsertRows(QModelIndex(), count, count + len(nodes) - 1)
+        self.records.extend(nodes)
+        self.endInsertRows()
+
+    def insertNodes(self, nodes, added):
+        for first, last in groupRuns(added):
+            self.beginInsertRows(QModelIndex(), first, last)
+            self.records.insert(first, nodes[first:last + 1])
+            self.endInsertRows()
+
+    def reorderRows(self, nodes):
+        self.layoutAboutToBeChanged.emit()
+
+        oldPositions = dict((node, row) for row, node in enumerate(self.nodes))
+        newPositions = dict((node, row) for row, node in enumerate(nodes))
+
+        oldNodes = self.nodes
+        self.records.reorder([oldPositions[node] for node in nodes])
+
+        persistentIndexes = self.persistentIndexList()
+        self.changePersistentIndexList(
+            persistentIndexes,
+            [self.index(newPositions[oldNodes[index.row()]]) for index in persistentIndexes]
+        )
+
+        self.layoutChanged.emit()
+
+    def resolveRows(self, first, last, notify=True):
+        """
+        Query the types of the rows between first and last that are not known yet, in one batch.
+        Records are resolved in place, so snapshots sharing them get them resolved as well.
+        """
+        resolved = self.records.resolve(range(max(0, first), min(last, len(self.records) - 1) + 1))
+        if resolved and notify:
+            self.dataChanged.emit(self.index(resolved[0]), self.index(resolved[-1]))
+
+    def invalidateRows(self, nodes):
+        """Node info cache listener, the invalidations of a command are applied together on the next tick."""
+        if nodes is None or self.invalidNodes is None:
+            self.invalidNodes = None
+        else:
+            self.invalidNodes.update(nodes)
 
-    def load(self, nodes):
-        self.clear()
-        self.nodes = nodes
+        if not self.invalidTimer.isActive():
+            self.invalidTimer.start(0)
 
-        for index, longName in enumerate(nodes):
-            objType = cmds.objectType(longName)
-            item = QListWidgetItem()
-            item.setData(Qt.UserRole, longName)
+    def unresolveRows(self):
+        nodes = self.invalidNodes
+        self.invalidNodes = set()
 
-            nodeType = cmds.objectType(longName)
-            shapes = cmds.listRelatives(longName, shapes=True, fullPath=True) if nodeType != 'objectSet' else None
-            shapType = cmds.objectType(shapes[0]) if shapes else None
+        # records are unresolved in place, each model sharing them notifies its own list of the same rows
+        for first, last in groupRuns(self.records.unresolve(nodes)):
+            self.dataChanged.emit(self.index(first), self.index(last))
 
-            finalType = nodeType if not shapType else shapType
-            isReferenced = cmds.referenceQuery(longName, isNodeReferenced=True)
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.records)
 
-            name = longName.split('|')[-1]
-            item.setToolTip('{} ({})'.format(name, objType))
-            wid = NodeWidget(name, objectType=finalType, isReferenced=isReferenced, parent=self)
-            wid.displayNamespace = self.displayNamespaces
-            # wid.secondaryColor = QColor(175, 125, 125)
-            wid.setFixedHeight(35)
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
 
-            self.addItem(item)
-            self.setItemWidget(item, wid)
-            item.setSizeHint(QSize(0, 40))
+        row = index.row()
+        record = NodeRecord(self.records, row)
+        if role in (self.TypeRole, self.ReferencedRole, Qt.ToolTipRole) and not record.isResolved:
+            self.resolveRows(row, row, notify=False)
 
+        if role == Qt.DisplayRole or role == self.NameRole:
+            return record.shortName
+        elif role == self.NodeRole:
+            return record.node
+        elif role == self.NamespaceRole:
+            return record.namespace
+        elif role == self.TypeRole:
+            return record.iconType
+        elif role == self.ReferencedRole:
+            return record.isReferenced
+        elif role == Qt.ToolTipRole:
+            return '{} ({})'.format(record.name, record.nodeType)
+        return None
 
-class NodeWidget(QWidget):
 
-    def __init__(self, longName, objectType=None, isReferenced=False, parent=None):
-        super(NodeWidget, self).__init__(parent)
+class NodeDelegate(QStyledItemDelegate):
 
-        longNameSplit = longName.split(':')
-        namespace = ':'.join(longNameSplit[:-1])
-        self.namespace = '{}:'.format(namespace) if namespace else namespace
-        self.name = longNameSplit[-1]
-        self.objectType = objectType
-        self.isReferenced = isReferenced
+    def __init__(self, parent=None):
+        super(NodeDelegate, self).__init__(parent)
 
         self.mainColor = QColor(200, 200, 200)
         self.secondaryColor = QColor(125, 125, 125)
         self.selectedColor = QColor(255, 255, 255)
 
-        self.setMinimumHeight(35)
+        self.namespacePen = QPen(self.secondaryColor)
+        self.namePen = QPen(self.mainColor)
+        self.selectedPen = QPen(self.selectedColor)
+
+        self.rowHeight = 40
+        self.iconHeight = 35
+
+        # text layouts keyed by (namespace, name), only valid for the current font and namespace display
+        self.maxLayouts = 4096
+        self.layouts = OrderedDict()
+
+        self.font = QFont()
+        self.font.setPixelSize(int(self.iconHeight * .66))
+        self.fontMetrics = QFontMetrics(self.font)
 
         self._displayNamespace = True
-        self.isSelected = False
 
     @property
     def displayNamespace(self):
@@ -591,62 +1149,278 @@ class NodeWidget(QWidget):
     @displayNamespace.setter
     def displayNamespace(self, value):
         self._displayNamespace = value
-        self.update()
+        self.layouts.clear()
+
+    def createStaticText(self, text):
+        staticText = QStaticText(text)
+        staticText.setTextFormat(Qt.PlainText)
+        staticText.prepare(QTransform(), self.font)
+        return staticText
+
+    def textLayout(self, namespace, name):
+        """Return the namespace static text, its width and the name static text of a row."""
+        key = (namespace, name)
+
+        layout = self.layouts.pop(key, None)
+        if layout is None:
+            if self.displayNamespace and namespace:
+                layout = (
+                    self.createStaticText(namespace),
+                    self.fontMetrics.horizontalAdvance(namespace),
+                    self.createStaticText(name)
+                )
+            else:
+                layout = (None, 0, self.createStaticText(name))
+        self.layouts[key] = layout
 
-    def paintEvent(self, *args, **kwargs):
-        painter = QPainter(self)
-        font = QFont()
-        font.setPixelSize(self.height() * .66)
-        fontMetrics = QFontMetrics(font)
-        fontHeight = fontMetrics.height()
+        if len(self.layouts) > self.maxLayouts:
+            self.layouts.popitem(last=False)
+
+        return layout
 
-        typeImage = QImage(':{}.svg'.format(self.objectType))
-        if typeImage.isNull():
-            typeImage = QImage(':default.svg')
-        typeImage = typeImage.smoothScaled(self.height(), self.height())
+    def sizeHint(self, option, index):
+        return QSize(0, self.rowHeight)
 
-        namespacePen = QPen()
-        namespacePen.setColor(self.secondaryColor if not self.isSelected else self.selectedColor)
+    def paint(self, painter, option, index):
+        painter.save()
 
-        namePen = QPen()
-        namePen.setColor(self.mainColor if not self.isSelected else self.selectedColor)
+        style = option.widget.style() if option.widget else QApplication.style()
+        style.drawPrimitive(QStyle.PE_PanelItemViewItem, option, painter, option.widget)
 
-        namespaceWidth = fontMetrics.horizontalAdvance(self.namespace) if self.displayNamespace else 0
-        nameWidth = fontMetrics.horizontalAdvance(self.name)
+        isSelected = bool(option.state & QStyle.State_Selected)
+        name = index.data(SelectionModel.NameRole)
+        namespace = index.data(SelectionModel.NamespaceRole)
+        objectType = index.data(SelectionModel.TypeRole)
+        isReferenced = index.data(SelectionModel.ReferencedRole)
 
-        typeRect = QRect(0, 0, self.height(), self.height())
+        height = self.iconHeight
+        x = option.rect.x()
+        y = option.rect.y()
 
-        namespaceRect = QRect(typeRect.x() + typeRect.width(), 0, namespaceWidth, fontHeight)
-        nameRect = QRect(namespaceRect.x() + namespaceRect.width(), 0, nameWidth, fontHeight)
+        typePixmap = iconCache.icon(
+            objectType, height, height, painter.device().devicePixelRatioF(), isReferenced=isReferenced
+        )
+        namespaceText, namespaceWidth, nameText = self.textLayout(namespace, name)
 
         # draw
-        painter.drawImage(typeRect, typeImage)
-        if self.isReferenced:
-            refRect = QRect(0, 0, self.height() * .5, self.height() * .5)
-            refImage = QImage(':reference.svg').smoothScaled(self.height() * .5, self.height() * .5)
-            painter.drawImage(refRect, refImage)
+        painter.drawPixmap(x, y, typePixmap)
+
+        painter.setFont(self.font)
+        if namespaceText is not None:
+            painter.setPen(self.namespacePen if not isSelected else self.selectedPen)
+            painter.drawStaticText(x + height, y, namespaceText)
+
+        painter.setPen(self.namePen if not isSelected else self.selectedPen)
+        painter.drawStaticText(x + height + namespaceWidth, y, nameText)
+
+        painter.restore()
+
 
-        painter.setFont(font)
-        painter.setPen(namespacePen)
-        if self.displayNamespace:
-            painter.drawText(namespaceRect, self.namespace)
+class SelectionTree(QListView):
 
-        painter.setPen(namePen)
-        painter.drawText(nameRect, self.name)
+    selectionDelta = Signal(list, list)
+
+    def __init__(self, *args, **kwargs):
+        super(SelectionTree, self).__init__(*args, **kwargs)
+        self.setSelectionMode(QListView.ExtendedSelection)
+        self.setUniformItemSizes(True)
+
+        # rows are laid out a batch at a time from the event loop, so the first paint does not wait for the whole list
+        self.setLayoutMode(QListView.Batched)
+        self.setBatchSize(500)
+
+        self.nodeModel = SelectionModel(self)
+        self.setModel(self.nodeModel)
+
+        self.delegate = NodeDelegate(self)
+        self.setItemDelegate(self.delegate)
+
+        # selected nodes, kept up to date from the selection deltas instead of being rebuilt on each change
+        self.selected = OrderedDict()
+        self.selectionModel().selectionChanged.connect(self.selectItems)
+        # rows removed while the list follows the scene are deselected, which is not a change to push back
+        self.isReloading = False
+        self.nodeModel.modelAboutToBeReset.connect(self.selected.clear)
+
+        self.displayNamespaces = True
+        self.snapshot = None
+
+        # rows resolved ahead of the viewport, above and below it
+        self.prefetchRows = 50
+        self.loadChunkSize = 2000
+
+    @property
+    def nodes(self):
+        return self.nodeModel.nodes
+
+    def rangeNodes(self, selection):
+        nodes = self.nodeModel.nodes
+        return [
+            nodes[row]
+            for selectionRange in selection
+            for row in range(selectionRange.top(), selectionRange.bottom() + 1)
+        ]
+
+    def selectItems(self, selected, deselected):
+        removed = [node for node in self.rangeNodes(deselected) if self.selected.pop(node, False)]
+
+        added = list()
+        for node in self.rangeNodes(selected):
+            if node not in self.selected:
+                self.selected[node] = True
+                added.append(node)
+
+        if not added and not removed or self.isReloading:
+            return
+
+        self.selectionDelta.emit(added, removed)
+
+    def toggleNamespaces(self, state):
+        self.displayNamespaces = state
+        self.delegate.displayNamespace = state
+        self.viewport().update()
+
+    def selectedNodes(self):
+        return list(self.selected)
+
+    def contextMenuEvent(self, event):
+        if not self.nodeModel.rowCount():
+            return
+
+        menu = QMenu(self)
+        for mode, label in (
+            (REPLACE, 'Select List'),
+            (ADD, 'Add List to Selection'),
+            (SUBTRACT, 'Subtract List from Selection'),
+            (INTERSECT, 'Intersect Selection with List'),
+            (TOGGLE, 'Toggle List in Selection'),
+        ):
+            menu.addAction(label).triggered.connect(partial(self.combineWithSelection, mode))
+
+        menu.exec_(event.globalPos())
+        menu.deleteLater()
+
+    def combineWithSelection(self, mode, *args):
+        """Combine every node of the list with the scene selection."""
+        self.finishLoading()
+        selectNodes(self.nodes, mode)
+
+    def resolveVisibleRows(self):
+        if not self.nodeModel.rowCount():
+            return
+
+        # rows have a fixed height, which still holds while the batched layout is not done
+        first = max(0, self.indexAt(QPoint(0, 0)).row())
+        last = first + self.viewport().height() // self.delegate.rowHeight
+
+        # rows about to be painted, no need to notify the view
+        self.nodeModel.resolveRows(first - self.prefetchRows, last + self.prefetchRows, notify=False)
+
+    def reload(self, nodes):
+        self.releaseSnapshot()
+        scheduler.cancel(self)
+
+        # a long tail of new nodes, such as the first show of a large selection, is appended by the scheduler
+        count = len(self.nodes)
+        if len(nodes) - count > self.loadChunkSize and nodes[:count] == self.nodes:
+            with profiler.timed('treeReload'):
+                self.nodeModel.appendRows(nodes[count:count + self.loadChunkSize])
+            scheduler.add(self, self.loadChunks(nodes, count + self.loadChunkSize))
+            return
+
+        with profiler.timed('treeReload'):
+            self.isReloading = True
+            try:
+                self.nodeModel.updateRows(nodes)
+            finally:
+                self.isReloading = False
+
+    def load(self, nodes):
+        """Show the first loadChunkSize nodes right away, the others are appended by the scheduler."""
+        self.releaseSnapshot()
+        scheduler.cancel(self)
+        with profiler.timed('load'):
+            self.isReloading = True
+            try:
+                self.nodeModel.setRows(nodes[:self.loadChunkSize])
+            finally:
+                self.isReloading = False
+
+        if len(nodes) > self.loadChunkSize:
+            scheduler.add(self, self.loadChunks(nodes, self.loadChunkSize))
+
+    def loadChunks(self, nodes, first):
+        for start in range(first, len(nodes), self.loadChunkSize):
+            chunk = nodes[start:start + self.loadChunkSize]
+            self.nodeModel.appendRows(chunk)
+            yield float(start + len(chunk)) / len(nodes)
+
+    def finishLoading(self):
+        scheduler.finish(self)
+
+    def loadSnapshot(self, snapshot):
+        """Show the nodes of snapshot, sharing its records instead of querying them again."""
+        self.releaseSnapshot()
+        scheduler.cancel(self)
+        self.snapshot = snapshot.acquire()
+        self.nodeModel.setSnapshot(snapshot)
+
+    def releaseSnapshot(self):
+        if self.snapshot is not None:
+            self.snapshot.release()
+            self.snapshot = None
+
+    def paintEvent(self, event):
+        with profiler.timed('paint'):
+            self.resolveVisibleRows()
+            super(SelectionTree, self).paintEvent(event)
 
 
 class TearOffSelectionWindow(QDialog):
 
-    def __init__(self, nodes, parent=None):
+    def __init__(self, snapshot, parent=None):
         super(TearOffSelectionWindow, self).__init__(parent)
         self.setWindowTitle('Tear Off Selection')
+        self.setAttribute(Qt.WA_DeleteOnClose)
+
+        self.selectionPush = SelectionPush()
 
         self.selectionTree = SelectionTree()
-        self.selectionTree.load(nodes)
-        self.selectionTree.itemSelectionChanged.connect(self.selectSelectionItem)
+        self.selectionTree.loadSnapshot(snapshot)
+        self.selectionTree.selectionDelta.connect(self.selectSelectionItem)
 
         layout = QVBoxLayout(self)
         layout.addWidget(self.selectionTree)
 
-    def selectSelectionItem(self, *args, **kwargs):
-        cmds.select(self.selectionTree.selectedNodes(), noExpand=True)
+    def selectSelectionItem(self, added=None, removed=None):
+        self.selectionPush.push(self.selectionTree.selectedNodes, added, removed)
+
+    def showEvent(self, *args, **kwargs):
+        self.selectionPush.start()
+        nodeInfoCache.acquire(self.selectionTree.nodeModel.invalidateRows)
+        super(TearOffSelectionWindow, self).showEvent(*args, **kwargs)
+
+    def hideEvent(self, *args, **kwargs):
+        self.selectionPush.stop()
+        nodeInfoCache.release(self.selectionTree.nodeModel.invalidateRows)
+        super(TearOffSelectionWindow, self).hideEvent(*args, **kwargs)
+
+    def closeEvent(self, *args, **kwargs):
+        self.selectionTree.releaseSnapshot()
+        scheduler.cancel(self.selectionTree)
+        super(TearOffSelectionWindow, self).closeEvent(*args, **kwargs)
+
+
+def checkStartupTimes():
+    budgets = (('import', IMPORT_TIME_BUDGET), ('firstShow', FIRST_SHOW_TIME_BUDGET))
+    for key, budget in budgets:
+        duration = startupTimes.get(key)
+        if duration is not None and duration > budget:
+            cmds.warning('Selection Editor {} took {:.3f}s, budget is {:.3f}s'.format(key, duration, budget))
+
+
+def showSelectionEditor():
+    return SelectionEditor.showWindow()
+
+
+startupTimes['import'] = time.time() - importStart